@@ -0,0 +1,246 @@
+"""RabbitMQ consumer adapter using aio-pika."""
+import asyncio
+import gzip
+import logging
+from functools import lru_cache
+from typing import Optional, List
+
+import aio_pika
+from aio_pika.abc import (
+    AbstractChannel,
+    AbstractIncomingMessage,
+    AbstractQueue,
+    AbstractRobustConnection,
+)
+from pydantic import BaseModel, Field, ValidationError
+
+from src.services.contract_comparison_service import ContractComparisonService
+from src.infrastructure.parsers.factory import ParserFactory
+from src.infrastructure.agents.factory import AgentFactory
+from src.infrastructure.repositories.factory import ResultCacheFactory
+from src.domain.models import ContractChangeResult
+from src.config.settings import settings
+from src.config.logging_config import configure_logging
+
+
+logger = logging.getLogger(__name__)
+
+# Replies at least this large are gzip-compressed (flagged via content_encoding)
+REPLY_GZIP_MIN_SIZE = 1024
+
+
+# Message models
+class ContractJobRequest(BaseModel):
+    """Job message consumed from the queue."""
+    job_id: str = Field(..., description="Unique job identifier")
+    original_image: str = Field(..., description="Path or URL of original contract")
+    amendment_image: str = Field(..., description="Path or URL of amendment")
+    metadata: Optional[dict] = Field(None, description="Optional metadata for tracing")
+
+
+class ContractJobResponse(BaseModel):
+    """Reply message published to the request's reply_to queue."""
+    job_id: str
+    status: str
+    result: Optional[ContractChangeResult] = None
+    error: Optional[str] = None
+    trace_id: Optional[str] = None
+    processing_time_ms: Optional[int] = None
+
+
+# Longest a Batch API job may take; deliveries waiting on one stay unacked that long
+BATCH_COMPLETION_WINDOW_MS = 24 * 60 * 60 * 1000
+
+# Bounds how many comparisons run at once across all batches. Batch mode jobs
+# mostly wait on their Batch API job, so every prefetched delivery gets a slot
+# and the dispatcher can gather them into one job
+_job_slots = asyncio.Semaphore(
+    settings.prefetch_count if settings.openai_batch_enabled else settings.max_concurrency
+)
+
+# Shared publisher connection for replies, created lazily on first use
+_publisher_conn: Optional[AbstractRobustConnection] = None
+_publisher_channel: Optional[AbstractChannel] = None
+_publisher_lock = asyncio.Lock()
+
+
+async def get_publisher_channel() -> AbstractChannel:
+    """Return the shared reply channel, connecting on first use."""
+    global _publisher_conn, _publisher_channel
+
+    if _publisher_channel is not None:
+        return _publisher_channel
+
+    async with _publisher_lock:
+        if _publisher_channel is None:
+            _publisher_conn = await aio_pika.connect_robust(settings.rabbitmq_url)
+            # Replies are best-effort; skip publisher confirms to avoid a round-trip per publish
+            _publisher_channel = await _publisher_conn.channel(publisher_confirms=False)
+    return _publisher_channel
+
+
+async def close_publisher() -> None:
+    """Close the shared publisher connection if it was opened."""
+    global _publisher_conn, _publisher_channel
+
+    if _publisher_conn is not None:
+        await _publisher_conn.close()
+    _publisher_conn = None
+    _publisher_channel = None
+
+
+@lru_cache(maxsize=1)
+def get_service() -> ContractComparisonService:
+    """Return the worker's shared service instance, built on first use."""
+    result_cache = ResultCacheFactory.create()
+    return ContractComparisonService(
+        parser=ParserFactory.create(result_cache=result_cache),
+        contextualization_agent=AgentFactory.create_contextualization_agent(),
+        extraction_agent=AgentFactory.create_extraction_agent(),
+        result_cache=result_cache,
+    )
+
+
+async def process_message(message: AbstractIncomingMessage) -> None:
+    """
+    Process a single contract comparison job.
+
+    Acknowledgement is handled by the caller, which acks or requeues each
+    delivery according to how this call ended.
+    """
+    try:
+        body = gzip.decompress(message.body) if message.content_encoding == "gzip" else message.body
+        # pydantic-core parses the raw bytes directly, no intermediate dict
+        request = ContractJobRequest.model_validate_json(body)
+    except (OSError, ValidationError) as e:
+        # Malformed jobs are dropped (acked with the batch) instead of requeued forever
+        logger.warning("Invalid job message %s: %s", message.message_id, e)
+        return
+
+    logger.debug("Job received: %s", request.job_id)
+
+    service = get_service()
+    async with _job_slots:
+        result = await service.compare_async(
+            request.original_image,
+            request.amendment_image,
+            contract_id=request.job_id,
+            metadata=request.metadata,
+        )
+
+    logger.info("Job %s completed with status %s", request.job_id, result.status)
+
+    if message.reply_to:
+        response = ContractJobResponse(
+            job_id=request.job_id,
+            status=result.status,
+            result=result.result,
+            error=result.error,
+            trace_id=result.trace_id,
+            processing_time_ms=result.processing_time_ms,
+        )
+        body = response.__pydantic_serializer__.to_json(response)
+        content_encoding = None
+        if len(body) >= REPLY_GZIP_MIN_SIZE:
+            body = gzip.compress(body, compresslevel=6)
+            content_encoding = "gzip"
+
+        channel = await get_publisher_channel()
+        await channel.default_exchange.publish(
+            aio_pika.Message(
+                body=body,
+                content_type="application/json",
+                content_encoding=content_encoding,
+                correlation_id=message.correlation_id,
+            ),
+            routing_key=message.reply_to,
+        )
+
+
+async def _next_batch(buffer: asyncio.Queue) -> List[AbstractIncomingMessage]:
+    """Wait for one delivery, then collect more until the batch is full or the timer fires."""
+    batch = [await buffer.get()]
+    while len(batch) < settings.consumer_batch_size:
+        try:
+            batch.append(await asyncio.wait_for(buffer.get(), timeout=settings.consumer_batch_timeout))
+        except asyncio.TimeoutError:
+            break
+    return batch
+
+
+async def _settle_batch(batch: List[AbstractIncomingMessage]) -> None:
+    """Process a batch concurrently, then ack or requeue each delivery by its own outcome."""
+    outcomes = await asyncio.gather(*(process_message(message) for message in batch), return_exceptions=True)
+    for message, outcome in zip(batch, outcomes):
+        try:
+            if isinstance(outcome, BaseException):
+                logger.error("Job message %s failed, requeueing", message.message_id, exc_info=outcome)
+                await message.nack(requeue=True)
+            else:
+                await message.ack()
+        except Exception:
+            # e.g. the channel closed during a reconnect; the broker redelivers the job
+            logger.exception("Could not settle job message %s", message.message_id)
+
+
+async def consume_batches(queue: AbstractQueue) -> None:
+    """
+    Consume jobs in batches with manual acknowledgement.
+
+    Jobs in a batch are processed concurrently and settled one by one, so a
+    failing job is requeued without its neighbours. Batches overlap: the next
+    one is collected while earlier ones run, so a slow job doesn't stall the
+    queue; ``prefetch_count`` bounds the unacked deliveries in flight.
+    """
+    buffer: asyncio.Queue = asyncio.Queue()
+    await queue.consume(buffer.put, no_ack=False)
+
+    running: set = set()
+    try:
+        while True:
+            batch = await _next_batch(buffer)
+            task = asyncio.create_task(_settle_batch(batch))
+            running.add(task)
+            task.add_done_callback(running.discard)
+    finally:
+        # Unsettled deliveries are requeued by the broker once the channel closes
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def start_consumer() -> None:
+    """Connect to RabbitMQ and start consuming contract jobs."""
+    if settings.openai_batch_enabled and settings.rabbitmq_consumer_timeout_ms < BATCH_COMPLETION_WINDOW_MS:
+        # The broker would close the channel and redeliver every job still waiting on a batch
+        raise RuntimeError(
+            "OPENAI_BATCH_ENABLED requires the broker's consumer_timeout to be raised to at least 24h "
+            "(and RABBITMQ_CONSUMER_TIMEOUT_MS set to match)"
+        )
+
+    connection = await aio_pika.connect_robust(settings.rabbitmq_url)
+
+    async with connection:
+        channel = await connection.channel()
+        await channel.set_qos(prefetch_count=settings.prefetch_count)
+
+        queue = await channel.declare_queue(settings.queue_name, durable=True)
+
+        logger.info(
+            "Consuming from %s (prefetch=%d, batch=%d)",
+            settings.queue_name, settings.prefetch_count, settings.consumer_batch_size,
+        )
+        try:
+            await consume_batches(queue)
+        finally:
+            await close_publisher()
+
+
+def main():
+    """Run the consumer until interrupted."""
+    configure_logging()
+    asyncio.run(start_consumer())
+
+
+if __name__ == "__main__":
+    main()
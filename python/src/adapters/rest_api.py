@@ -1,20 +1,30 @@
 """REST API adapter using FastAPI."""
+import time
 import uuid
 import asyncio
+import logging
+from functools import lru_cache
+from contextlib import asynccontextmanager
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 
 from src.services.contract_comparison_service import ContractComparisonService
 from src.infrastructure.parsers.factory import ParserFactory
 from src.infrastructure.agents.factory import AgentFactory
-from src.domain.models import ContractChangeResult
+from src.infrastructure.repositories.factory import JobStoreFactory, ResultCacheFactory
+from src.domain.interfaces import JobStore
+from src.domain.models import ContractChangeResult, ProcessingResult
+from src.config.settings import settings
+from src.config.logging_config import configure_logging
 
-# Thread pool for running blocking operations
-executor = ThreadPoolExecutor(max_workers=4)
+
+logger = logging.getLogger(__name__)
 
 
 # Request/Response models
@@ -23,7 +33,10 @@ class CompareRequest(BaseModel):
     original_image: str = Field(..., description="Path or base64 of original contract")
     amendment_image: str = Field(..., description="Path or base64 of amendment")
     contract_id: Optional[str] = Field(None, description="Optional contract ID")
-    async_mode: bool = Field(False, alias="async", description="Run asynchronously")
+    async_mode: bool = Field(True, alias="async", description="Run asynchronously")
+    sync_timeout_ms: Optional[int] = Field(
+        None, description="Max time to wait in sync mode before returning 202 (capped by SYNC_TIMEOUT_MS)"
+    )
     callback_url: Optional[str] = Field(None, description="Webhook URL for async results")
 
 
@@ -46,6 +59,8 @@ class JobStatusResponse(BaseModel):
     error: Optional[str] = None
     created_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    trace_id: Optional[str] = None
+    processing_time_ms: Optional[int] = None
 
 
 class ProgressResponse(BaseModel):
@@ -65,8 +80,18 @@ class HealthResponse(BaseModel):
     version: str = "1.0.0"
 
 
-# In-memory job storage (replace with Redis in production)
-jobs_store: dict = {}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Configure logging and size both thread pools from MAX_CONCURRENCY."""
+    configure_logging()
+    if settings.openai_batch_enabled:
+        logger.warning("OPENAI_BATCH_ENABLED is ignored by the REST API")
+    # asyncio.to_thread (pipeline steps) runs on the loop's default executor
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=settings.max_concurrency))
+    # FastAPI runs sync dependencies and endpoints through anyio's limiter
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.max_concurrency
+    yield
 
 
 # FastAPI app
@@ -74,31 +99,90 @@ app = FastAPI(
     title="Contract Comparison API",
     description="API for comparing contract documents and extracting changes",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Results carry long summaries; compress anything worth it for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
+@lru_cache(maxsize=1)
 def get_service() -> ContractComparisonService:
-    """Create a new service instance with dependencies."""
+    """
+    Return the process-wide service instance.
+    
+    The parser and agents are stateless and their OpenAI clients are
+    thread-safe, so they are built once and shared by every request.
+    """
+    result_cache = ResultCacheFactory.create()
     return ContractComparisonService(
-        parser=ParserFactory.create(),
-        contextualization_agent=AgentFactory.create_contextualization_agent(),
-        extraction_agent=AgentFactory.create_extraction_agent(),
+        parser=ParserFactory.create(result_cache=result_cache),
+        # Batch API jobs take minutes to hours; interactive requests always go online
+        contextualization_agent=AgentFactory.create_contextualization_agent(batch=False),
+        extraction_agent=AgentFactory.create_extraction_agent(batch=False),
+        result_cache=result_cache,
     )
 
 
-def process_comparison_async(job_id: str, original: str, amendment: str):
-    """Background task for async processing."""
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """Return the job store shared by all requests of this process."""
+    return JobStoreFactory.create()
+
+
+# Strong references to running comparisons so they are not garbage-collected mid-flight
+_running_jobs: set = set()
+
+# Minimum spacing between progress writes to the job store
+PROGRESS_MIN_INTERVAL_NS = 200_000_000
+
+
+async def process_comparison_async(job_id: str, original: str, amendment: str) -> ProcessingResult:
+    """Run a comparison, recording progress and the final status in the job store."""
+    job_store = get_job_store()
+    progress_writes: list = []
+    last_write_ns = 0
+    
+    def progress_callback(progress_data: dict):
+        """Schedule a progress write on the event loop without blocking the pipeline."""
+        nonlocal last_write_ns
+        now_ns = time.monotonic_ns()
+        # Updates closer together than the interval are superseded by the next one anyway
+        if progress_data["progress"] < 100 and now_ns - last_write_ns < PROGRESS_MIN_INTERVAL_NS:
+            return
+        last_write_ns = now_ns
+        progress_writes.append(asyncio.create_task(
+            job_store.save_progress(job_id, {
+                **progress_data,
+                "updated_at": datetime.now(timezone.utc),
+            })
+        ))
+    
+    # Native async pipeline: the OpenAI calls are awaited on the event loop
     service = get_service()
-    result = service.compare(original, amendment, contract_id=job_id)
+    result = await service.compare_async(
+        original,
+        amendment,
+        contract_id=job_id,
+        progress_callback=progress_callback,
+    )
+    await asyncio.gather(*progress_writes)
     
-    jobs_store[job_id] = {
+    # Update final status
+    await job_store.save(job_id, {
         "status": result.status,
         "result": result.result,
         "error": result.error,
-        "completed_at": datetime.utcnow(),
+        "completed_at": datetime.now(timezone.utc),
         "trace_id": result.trace_id,
         "processing_time_ms": result.processing_time_ms,
-    }
+    })
+    
+    logger.info("Job %s completed with status %s", job_id, result.status)
+    if result.error:
+        logger.warning("Job %s failed: %s", job_id, result.error)
+    
+    return result
 
 
 @app.get("/api/v1/health", response_model=HealthResponse)
@@ -106,102 +190,63 @@ async def health_check():
     """Health check endpoint."""
     return HealthResponse(
         status="healthy",
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
     )
 
 
 @app.post("/api/v1/contracts/compare", response_model=CompareResponse)
 async def compare_contracts(
     request: CompareRequest,
-    background_tasks: BackgroundTasks,
+    response: Response,
 ):
     """
     Compare two contract images and extract changes.
     
-    - **sync mode** (default): Processes immediately and returns result
-    - **async mode**: Queues job and returns job_id for polling
+    - **async mode** (default): Returns 202 with a Location header for polling
+    - **sync mode** (`"async": false`): Waits up to `sync_timeout_ms` for the result,
+      then falls back to 202 while the job keeps running
     """
     job_id = request.contract_id or str(uuid.uuid4())
     
-    print(f"\n{'='*80}")
-    print(f"🚀 NEW JOB RECEIVED - ID: {job_id}")
-    print(f"   Mode: {'ASYNC' if request.async_mode else 'SYNC'}")
-    print(f"   Original: {request.original_image[:50]}...")
-    print(f"   Amendment: {request.amendment_image[:50]}...")
-    print(f"{'='*80}\n")
+    # %.50s truncates lazily, nothing is formatted unless DEBUG is enabled
+    logger.debug(
+        "New job %s (mode=%s, original=%.50s, amendment=%.50s)",
+        job_id, "async" if request.async_mode else "sync",
+        request.original_image, request.amendment_image,
+    )
     
-    if request.async_mode:
-        # Async mode: queue for background processing
-        jobs_store[job_id] = {
-            "status": "pending",
-            "result": None,
-            "error": None,
-            "created_at": datetime.utcnow(),
-            "completed_at": None,
-        }
-        
-        background_tasks.add_task(
-            process_comparison_async,
-            job_id,
-            request.original_image,
-            request.amendment_image,
-        )
-        
-        return CompareResponse(
-            job_id=job_id,
-            status="queued",
-            message="Job queued for processing",
-        )
+    job_store = get_job_store()
     
     # Initialize job in store BEFORE processing starts (for progress polling)
-    jobs_store[job_id] = {
+    await job_store.save(job_id, {
         "status": "processing",
         "result": None,
         "error": None,
-        "created_at": datetime.utcnow(),
+        "created_at": datetime.now(timezone.utc),
         "completed_at": None,
-        "progress": {
-            "progress": 0,
-            "step": "Starting",
-            "message": "Initializing processing",
-            "updated_at": datetime.utcnow(),
-        }
-    }
-    
-    def progress_callback(progress_data: dict):
-        """Update progress in jobs_store."""
-        jobs_store[job_id]["progress"] = {
-            **progress_data,
-            "updated_at": datetime.utcnow(),
-        }
+    })
+    await job_store.save_progress(job_id, {
+        "progress": 0,
+        "step": "Starting",
+        "message": "Initializing processing",
+        "updated_at": datetime.now(timezone.utc),
+    })
     
-    # Run the comparison in a thread pool to avoid blocking the event loop
-    service = get_service()
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        executor,
-        lambda: service.compare(
-            request.original_image,
-            request.amendment_image,
-            contract_id=job_id,
-            progress_callback=progress_callback,
-        )
+    task = asyncio.create_task(
+        process_comparison_async(job_id, request.original_image, request.amendment_image)
     )
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
     
-    # Update final status
-    jobs_store[job_id].update({
-        "status": result.status,
-        "result": result.result,
-        "error": result.error,
-        "completed_at": datetime.utcnow(),
-        "trace_id": result.trace_id,
-        "processing_time_ms": result.processing_time_ms,
-    })
+    if request.async_mode:
+        return _accepted(response, job_id, "Job queued for processing")
     
-    print(f"✅ Job {job_id} completed - Status: {result.status}")
-    if result.error:
-        print(f"❌ Error: {result.error}")
-    print()
+    timeout_ms = min(request.sync_timeout_ms or settings.sync_timeout_ms, settings.sync_timeout_ms)
+    try:
+        # Shielded so a timeout (or client disconnect) leaves the job running
+        result = await asyncio.wait_for(asyncio.shield(task), timeout=timeout_ms / 1000)
+    except asyncio.TimeoutError:
+        return _accepted(response, job_id, f"Job still running after {timeout_ms} ms, poll for the result")
     
     return CompareResponse(
         job_id=job_id,
@@ -213,14 +258,20 @@ async def compare_contracts(
     )
 
 
+def _accepted(response: Response, job_id: str, message: str) -> CompareResponse:
+    """Build a 202 response pointing the client at the job status endpoint."""
+    response.status_code = 202
+    response.headers["Location"] = f"/api/v1/jobs/{job_id}"
+    return CompareResponse(job_id=job_id, status="processing", message=message)
+
+
 @app.get("/api/v1/jobs/{job_id}", response_model=JobStatusResponse)
 async def get_job_status(job_id: str):
     """Get the status of an async job."""
-    if job_id not in jobs_store:
+    job = await get_job_store().get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
-    
     return JobStatusResponse(
         job_id=job_id,
         status=job["status"],
@@ -228,17 +279,20 @@ async def get_job_status(job_id: str):
         error=job.get("error"),
         created_at=job.get("created_at"),
         completed_at=job.get("completed_at"),
+        trace_id=job.get("trace_id"),
+        processing_time_ms=job.get("processing_time_ms"),
     )
 
 
 @app.get("/api/v1/jobs/{job_id}/progress", response_model=ProgressResponse)
 async def get_job_progress(job_id: str):
     """Get the current progress of a job."""
-    if job_id not in jobs_store:
+    job_store = get_job_store()
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
-    progress_data = job.get("progress", {})
+    progress_data = await job_store.get_progress(job_id) or {}
     
     return ProgressResponse(
         job_id=job_id,
@@ -246,5 +300,5 @@ async def get_job_progress(job_id: str):
         progress=progress_data.get("progress", 0),
         step=progress_data.get("step", "Initializing"),
         message=progress_data.get("message", "Starting processing"),
-        updated_at=progress_data.get("updated_at", datetime.utcnow()),
+        updated_at=progress_data.get("updated_at", datetime.now(timezone.utc)),
     )
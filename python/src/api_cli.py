@@ -1,7 +1,11 @@
 """CLI for starting the Contract Comparison API server."""
+import sys
+
 import typer
 import uvicorn
 
+from src.config.settings import settings
+
 app = typer.Typer(help="Contract Comparison API Server")
 
 
@@ -9,8 +13,8 @@ app = typer.Typer(help="Contract Comparison API Server")
 def start(
     host: str = typer.Option("0.0.0.0", help="Host to bind to"),
     port: int = typer.Option(8000, help="Port to bind to"),
-    reload: bool = typer.Option(True, help="Enable auto-reload"),
-    workers: int = typer.Option(1, help="Number of worker processes"),
+    reload: bool = typer.Option(settings.api_reload, help="Enable auto-reload (development only)"),
+    workers: int = typer.Option(settings.api_workers, help="Number of worker processes"),
 ):
     """Start the Contract Comparison API server."""
     typer.echo(f"🚀 Starting Contract Comparison API on {host}:{port}")
@@ -24,6 +28,11 @@ def start(
         port=port,
         reload=reload,
         workers=workers if not reload else 1,
+        # uvloop is not available on Windows
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        # Sync comparisons hold the connection for the whole pipeline
+        timeout_keep_alive=300,
     )
 
 
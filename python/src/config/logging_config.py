@@ -0,0 +1,38 @@
+"""Logging setup for the API and worker processes."""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from src.config.settings import settings
+
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Configure root logging once per process.
+    
+    Records are handed to a background listener thread through a queue, so
+    code running on the event loop never blocks on writing to stderr.
+    """
+    global _listener
+    
+    if _listener is not None:
+        return
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel((level or settings.log_level).upper())
+    root.addHandler(QueueHandler(log_queue))
+    
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
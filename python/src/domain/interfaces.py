@@ -1,4 +1,5 @@
 """Abstract base classes and interfaces for the domain layer."""
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Optional, Any
 
@@ -31,11 +32,28 @@ class ImageParserStrategy(ABC):
             DocumentStructure with extracted text and structure
         """
         pass
+    
+    async def aparse(
+        self,
+        image_path: str,
+        document_type: str,
+        trace: Optional[Any] = None,
+    ) -> DocumentStructure:
+        """
+        Async variant of ``parse``.
+        
+        Runs ``parse`` in a worker thread by default; implementations with a
+        native async client should override it.
+        """
+        return await asyncio.to_thread(self.parse, image_path, document_type, trace)
 
 
 class ContextualizationAgent(ABC):
     """Abstract interface for contextualization agent."""
     
+    # Part of the result cache keys; must change whenever the prompt or output schema does
+    version = ""
+    
     @abstractmethod
     def run(
         self,
@@ -55,11 +73,23 @@ class ContextualizationAgent(ABC):
             ContextualizationResult with document analysis
         """
         pass
+    
+    async def arun(
+        self,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+        trace: Optional[Any] = None,
+    ) -> ContextualizationResult:
+        """Async variant of ``run``; runs it in a worker thread by default."""
+        return await asyncio.to_thread(self.run, original_doc, amendment_doc, trace)
 
 
 class ExtractionAgent(ABC):
     """Abstract interface for extraction agent."""
     
+    # Part of the result cache keys; must change whenever the prompt or output schema does
+    version = ""
+    
     @abstractmethod
     def run(
         self,
@@ -77,6 +107,14 @@ class ExtractionAgent(ABC):
             ContractChangeResult with extracted changes
         """
         pass
+    
+    async def arun(
+        self,
+        contextualization: ContextualizationResult,
+        trace: Optional[Any] = None,
+    ) -> ContractChangeResult:
+        """Async variant of ``run``; runs it in a worker thread by default."""
+        return await asyncio.to_thread(self.run, contextualization, trace)
 
 
 class ContractRepository(ABC):
@@ -105,3 +143,114 @@ class ContractRepository(ABC):
             result: Processing result to save
         """
         pass
+
+
+class JobStore(ABC):
+    """Abstract interface for job status and progress storage."""
+    
+    @abstractmethod
+    async def save(self, job_id: str, fields: dict) -> None:
+        """
+        Create a job record or update some of its fields.
+        
+        Args:
+            job_id: Job identifier
+            fields: Fields to set (status, result, error, timestamps, ...)
+        """
+        pass
+    
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[dict]:
+        """
+        Retrieve a job record.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Job fields, or None if the job is unknown or expired
+        """
+        pass
+    
+    @abstractmethod
+    async def save_progress(self, job_id: str, progress: dict) -> None:
+        """
+        Store the latest progress update of a job.
+        
+        Args:
+            job_id: Job identifier
+            progress: Progress fields (progress, step, message, updated_at)
+        """
+        pass
+    
+    @abstractmethod
+    async def get_progress(self, job_id: str) -> Optional[dict]:
+        """
+        Retrieve the latest progress update of a job.
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Progress fields, or None if no progress was reported yet
+        """
+        pass
+
+
+class ResultCache(ABC):
+    """Abstract interface for caching pipeline outputs by input content."""
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        """
+        Retrieve a cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached value, or None on a miss
+        """
+        pass
+    
+    @abstractmethod
+    async def set(self, key: str, value: dict) -> None:
+        """
+        Store a value in the cache.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        pass
+
+
+class ImageStore(ABC):
+    """Abstract interface for hosting images the vision model fetches by URL."""
+    
+    @abstractmethod
+    def put(self, data: bytes, media_type: str) -> str:
+        """
+        Upload an image.
+        
+        Args:
+            data: Encoded image bytes
+            media_type: MIME type of ``data``
+        
+        Returns:
+            Key identifying the stored image
+        """
+        pass
+    
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """
+        Build a URL the vision API can fetch a stored image from.
+        
+        Args:
+            key: Key returned by ``put``
+        
+        Returns:
+            HTTPS URL, typically short-lived
+        """
+        pass
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
-from typing import List
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Literal, Optional
 
 
 class DocumentStructure(BaseModel):
@@ -11,16 +12,39 @@ class DocumentStructure(BaseModel):
     document_type: str = Field(..., description="Type: 'original' or 'amendment'")
 
 
+class SectionCorrespondence(BaseModel):
+    """A section of the original contract mapped to its counterpart in the amendment."""
+    
+    # Mappings are shared between results (e.g. merged chunks) and never edited
+    model_config = ConfigDict(frozen=True)
+    
+    original_section: str = Field(description="Section name in the original contract")
+    amendment_section: str = Field(description="Corresponding section in the amendment")
+    status: str = Field(description="Status: modified, added, removed, or unchanged")
+
+
+SECTIONS_ADAPTER = TypeAdapter(List[SectionCorrespondence])
+
+
 class ContextualizationResult(BaseModel):
     """Output from Agent 1 - Contextualization Agent."""
     
     original_structure: DocumentStructure = Field(..., description="Structure of the original contract")
     amendment_structure: DocumentStructure = Field(..., description="Structure of the amendment")
-    corresponding_sections: List[dict] = Field(
+    corresponding_sections: List[SectionCorrespondence] = Field(
         ..., 
         description="Mapping of sections between original and amendment"
     )
     analysis_notes: str = Field(..., description="Agent's analysis notes about the documents")
+    changes: Optional["ContractChangeResult"] = Field(
+        None,
+        description="Changes already extracted by a fused Agent 1 + 2 call, if any"
+    )
+    
+    @cached_property
+    def corresponding_sections_json(self) -> str:
+        """Compact JSON of the section mapping, serialized once per result."""
+        return SECTIONS_ADAPTER.dump_json(self.corresponding_sections).decode()
 
 
 class ContractChangeResult(BaseModel):
@@ -44,10 +68,17 @@ class ContractChangeResult(BaseModel):
 
 
 class ProcessingResult(BaseModel):
-    """Complete processing result including metadata."""
+    """
+    Complete processing result including metadata.
+    
+    The service builds these with ``model_construct`` from values it already
+    validated; only data crossing a boundary (e.g. a deserialized result)
+    goes through ``model_validate``.
+    """
     
     contract_id: str = Field(..., description="Unique identifier for this processing job")
-    status: str = Field(..., pattern="^(success|error)$", description="Processing status")
+    # A literal is checked by string comparison in pydantic-core, no regex match per result
+    status: Literal["success", "error"] = Field(..., description="Processing status")
     result: ContractChangeResult | None = Field(None, description="The extracted changes")
     error: str | None = Field(None, description="Error message if status is error")
     trace_id: str | None = Field(None, description="Langfuse trace ID for debugging")
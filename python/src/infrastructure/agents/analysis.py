@@ -0,0 +1,113 @@
+"""Fused contract analysis agent: Agent 1 and Agent 2 in a single LLM call."""
+import hashlib
+from typing import Optional, Any, List
+
+from pydantic import Field
+
+from src.domain.interfaces import ExtractionAgent
+from src.domain.models import DocumentStructure, ContextualizationResult, ContractChangeResult
+from src.config.settings import settings
+from src.infrastructure.agents.contextualization import (
+    DOCUMENTS_PROMPT,
+    ContextualizationOutput,
+    LangChainContextualizationAgent,
+)
+from src.infrastructure.agents.extraction import LangChainExtractionAgent
+
+
+class ContractAnalysisOutput(ContextualizationOutput):
+    """Schema for the fused agent output: Agent 1's mapping followed by Agent 2's changes."""
+    sections_changed: List[str] = Field(
+        description="List of section names/identifiers that were modified"
+    )
+    topics_touched: List[str] = Field(
+        description="List of business/legal topics affected by the changes"
+    )
+    summary_of_the_change: str = Field(
+        description="Detailed description of what changed and its implications"
+    )
+
+
+SYSTEM_PROMPT = """You are a Contract Analysis Specialist.
+
+You analyze two contract documents (original and amendment) in two steps.
+
+Step 1 - Contextualization:
+1. Identify the structure of both documents
+2. Map corresponding sections between original and amendment
+3. Note any new sections added or sections removed
+4. Provide analysis notes about the relationship between documents
+
+Step 2 - Change extraction, based on your Step 1 mapping:
+1. sections_changed: List of section names/identifiers that were modified
+2. topics_touched: List of business/legal topics affected by the changes
+3. summary_of_the_change: Detailed description of what changed and its implications
+
+Be thorough, precise and specific."""
+
+HUMAN_PROMPT = DOCUMENTS_PROMPT + "Please map the corresponding sections of both documents, then extract the changes between them."
+
+
+class LangChainContractAnalysisAgent(LangChainContextualizationAgent):
+    """
+    Contextualization agent that also extracts the changes in the same call.
+    
+    The documents are sent once and the second round-trip disappears; the
+    changes ride along on ``ContextualizationResult.changes`` for
+    ``FusedExtractionAgent`` to pick up.
+    """
+    
+    system_prompt = SYSTEM_PROMPT
+    human_prompt = HUMAN_PROMPT
+    output_schema = ContractAnalysisOutput
+    name = "analysis"
+    
+    def _max_tokens(self) -> int:
+        """Output cap covering both stages."""
+        return settings.contextualization_max_tokens + settings.extraction_max_tokens
+    
+    def _to_result(
+        self,
+        result: ContractAnalysisOutput,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+    ) -> ContextualizationResult:
+        """Build a ContextualizationResult carrying the extracted changes."""
+        contextualization = super()._to_result(result, original_doc, amendment_doc)
+        contextualization.changes = LangChainExtractionAgent._to_result(result)
+        return contextualization
+
+
+class FusedExtractionAgent(ExtractionAgent):
+    """
+    Extraction agent for the fused pipeline.
+    
+    Returns the changes the analysis agent already extracted, and only calls
+    the wrapped agent for contextualizations without them (e.g. cached before
+    fusion was enabled).
+    """
+    
+    def __init__(self, fallback: ExtractionAgent):
+        """Initialize with the agent used when no changes were pre-extracted."""
+        self.fallback = fallback
+        self.version = hashlib.sha256(f"fused:{fallback.version}".encode()).hexdigest()[:12]
+    
+    def run(
+        self,
+        contextualization: ContextualizationResult,
+        trace: Optional[Any] = None,
+    ) -> ContractChangeResult:
+        """Return the pre-extracted changes, or extract them with the fallback agent."""
+        if contextualization.changes is not None:
+            return contextualization.changes
+        return self.fallback.run(contextualization, trace)
+    
+    async def arun(
+        self,
+        contextualization: ContextualizationResult,
+        trace: Optional[Any] = None,
+    ) -> ContractChangeResult:
+        """Async variant of ``run``."""
+        if contextualization.changes is not None:
+            return contextualization.changes
+        return await self.fallback.arun(contextualization, trace)
@@ -0,0 +1,132 @@
+"""Common functionality shared by the LangChain agents."""
+import hashlib
+from typing import Optional, Any, List, Tuple, Type
+
+import orjson
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_openai import ChatOpenAI
+from openai.lib._parsing._completions import type_to_response_format_param
+from pydantic import BaseModel
+
+from src.domain.models import DocumentStructure
+from src.infrastructure.batch_dispatcher import get_batch_dispatcher
+
+
+TRUNCATION_MARKER = " [...]"
+
+# LangChain message types to Chat Completions roles
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+def callbacks_config(trace: Optional[Any] = None) -> dict:
+    """Build the chain config with Langfuse callbacks when a trace is available."""
+    if trace and hasattr(trace, 'get_langchain_handler'):
+        return {"callbacks": [trace.get_langchain_handler()]}
+    return {}
+
+
+def prompt_version(prompt: ChatPromptTemplate, schema: Type[BaseModel]) -> str:
+    """
+    Hash an agent's prompt templates and output schema.
+    
+    Built like the parser's ``PROMPT_VERSION`` and part of the result cache
+    keys, so editing either invalidates the agent's cached outputs.
+    """
+    templates = "".join(message.prompt.template for message in prompt.messages)
+    return hashlib.sha256(templates.encode() + orjson.dumps(type_to_response_format_param(schema))).hexdigest()[:12]
+
+
+async def ainvoke_batched(
+    llm: ChatOpenAI,
+    prompt: ChatPromptTemplate,
+    inputs: dict,
+    schema: Type[BaseModel],
+) -> BaseModel:
+    """
+    Run a structured-output chain call through the Batch API dispatcher.
+    
+    Builds the same request the chain would send online (messages, sampling
+    params, json_schema response format) and parses the reply into ``schema``.
+    """
+    body = {
+        "model": llm.model_name,
+        "messages": [
+            {"role": _ROLES[message.type], "content": message.content}
+            for message in prompt.format_messages(**inputs)
+        ],
+        "temperature": llm.temperature,
+        "max_completion_tokens": llm.max_tokens,
+        "response_format": type_to_response_format_param(schema),
+        **(llm.extra_body or {}),
+    }
+    # Drop params the model doesn't accept (ChatOpenAI unsets temperature for reasoning models)
+    body = {key: value for key, value in body.items() if value is not None}
+    
+    response = await get_batch_dispatcher().submit(body)
+    message = response["choices"][0]["message"]
+    if message.get("content") is None:
+        # Refusals carry no content to validate; report them instead of a JSON error
+        raise ValueError(f"LLM refused the request: {message.get('refusal')}")
+    return schema.model_validate_json(message["content"])
+
+
+def _section_offsets(text: str, sections: List[str]) -> List[Tuple[str, int]]:
+    """Locate each section header in the text, in document order."""
+    offsets = []
+    cursor = 0
+    for section in sections:
+        start = text.find(section, cursor)
+        if start == -1:
+            continue
+        offsets.append((section, start))
+        cursor = start + len(section)
+    return offsets
+
+
+def _clip(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut."""
+    return text if len(text) <= limit else text[:limit].rstrip() + TRUNCATION_MARKER
+
+
+def split_sections(document: DocumentStructure) -> List[Tuple[str, str]]:
+    """
+    Split a document's text into ``(header, body)`` pairs along its section headers.
+    
+    Text before the first header (title, parties, recitals) is kept as an
+    untitled first section. Returns an empty list when no header is found.
+    """
+    text = document.full_text
+    offsets = _section_offsets(text, document.sections)
+    if not offsets:
+        return []
+    
+    ends = [start for _, start in offsets[1:]] + [len(text)]
+    return [("", text[:offsets[0][1]].strip())] + [
+        (section, text[start + len(section):end].strip())
+        for (section, start), end in zip(offsets, ends)
+    ]
+
+
+def condense_text(document: DocumentStructure, max_chars_per_section: int, max_total_chars: int) -> str:
+    """
+    Condense a document to its section headers and the opening of each section.
+    
+    Each section body is cut to ``max_chars_per_section``; if the result still
+    exceeds ``max_total_chars``, every body is shrunk proportionally. Documents
+    whose headers cannot be found in the text are simply cut to the total cap.
+    """
+    parts = split_sections(document)
+    if not parts:
+        return _clip(document.full_text, max_total_chars)
+    
+    limits = [min(len(body), max_chars_per_section) for _, body in parts]
+    budget = max(max_total_chars - sum(len(header) for header, _ in parts), 0)
+    if sum(limits) > budget:
+        ratio = budget / sum(limits)
+        limits = [int(limit * ratio) for limit in limits]
+    
+    return "\n\n".join(
+        f"{header}\n{_clip(body, limit)}".strip()
+        for (header, body), limit in zip(parts, limits)
+        if header or body
+    )
@@ -0,0 +1,201 @@
+"""Section-chunked contextualization: fan Agent 1 out over long contracts."""
+import asyncio
+import contextvars
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, List, Tuple
+
+from src.domain.interfaces import ContextualizationAgent
+from src.domain.models import DocumentStructure, ContextualizationResult
+from src.config.settings import settings
+from src.infrastructure.agents.base import split_sections
+
+
+Part = Tuple[str, str]
+
+WORD = re.compile(r"\w+")
+# Characters of each section body compared when pairing sections
+SIMILARITY_CHARS = 300
+# Pairs scoring below this token overlap are treated as added/removed sections
+MIN_SIMILARITY = 0.3
+EMPTY_PART = "(No corresponding sections in this part of the document.)"
+
+
+def _tokens(part: Part) -> set:
+    """Word set of a section's header and opening text."""
+    header, body = part
+    return set(WORD.findall(f"{header} {body[:SIMILARITY_CHARS]}".lower()))
+
+
+def _similarity(a: set, b: set) -> float:
+    """Jaccard overlap of two word sets."""
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def pair_sections(
+    original: List[Part],
+    amendment: List[Part],
+) -> List[Tuple[Optional[Part], Optional[Part]]]:
+    """
+    Match original sections to amendment sections by token overlap.
+    
+    Pairs are assigned greedily, best match first. The result follows the
+    original's order, with unmatched amendment sections slotted in where they
+    appear in the amendment; unmatched sections are paired with ``None``.
+    """
+    original_tokens = [_tokens(part) for part in original]
+    amendment_tokens = [_tokens(part) for part in amendment]
+    scores = sorted(
+        (
+            (_similarity(a, b), i, j)
+            for i, a in enumerate(original_tokens)
+            for j, b in enumerate(amendment_tokens)
+        ),
+        reverse=True,
+    )
+    
+    matches = {}
+    matched = set()
+    for score, i, j in scores:
+        if score < MIN_SIMILARITY:
+            break
+        if i not in matches and j not in matched:
+            matches[i] = j
+            matched.add(j)
+    
+    pairs = []
+    next_j = 0
+    for i, part in enumerate(original):
+        j = matches.get(i)
+        if j is not None:
+            pairs.extend((None, amendment[k]) for k in range(next_j, j) if k not in matched)
+            next_j = max(next_j, j + 1)
+        pairs.append((part, amendment[j] if j is not None else None))
+    pairs.extend((None, amendment[k]) for k in range(next_j, len(amendment)) if k not in matched)
+    return pairs
+
+
+def _sub_document(document: DocumentStructure, parts: List[Optional[Part]]) -> DocumentStructure:
+    """Build the slice of a document holding the given sections."""
+    parts = [part for part in parts if part is not None]
+    text = "\n\n".join(f"{header}\n{body}".strip() for header, body in parts)
+    # Prompt input only, never returned: skip validation so short or empty slices are allowed
+    return DocumentStructure.model_construct(
+        title=document.title,
+        sections=[header for header, _ in parts if header],
+        full_text=text or EMPTY_PART,
+        document_type=document.document_type,
+    )
+
+
+class ChunkedContextualizationAgent(ContextualizationAgent):
+    """
+    Contextualization agent that splits long contracts into groups of matching sections.
+    
+    Each group is contextualized by the wrapped agent concurrently and the
+    section mappings are merged, so long documents are mapped in full instead
+    of being condensed into one call. Short documents go straight through.
+    """
+    
+    def __init__(
+        self,
+        agent: ContextualizationAgent,
+        sections_per_chunk: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize the agent.
+        
+        Args:
+            agent: Agent that contextualizes each chunk
+            sections_per_chunk: Section pairs per call, defaults to settings.context_chunk_sections
+            max_concurrency: Chunk calls in flight, defaults to settings.context_chunk_concurrency
+        """
+        self.agent = agent
+        self.sections_per_chunk = sections_per_chunk or settings.context_chunk_sections
+        self.max_concurrency = max_concurrency or settings.context_chunk_concurrency
+        # One pool for the agent's lifetime; sync chunk calls from concurrent requests share it
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="context-chunk")
+        # Chunked mappings differ from whole-document ones, and with the chunk size
+        self.version = hashlib.sha256(f"{agent.version}:chunks={self.sections_per_chunk}".encode()).hexdigest()[:12]
+    
+    def run(
+        self,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+        trace: Optional[Any] = None,
+    ) -> ContextualizationResult:
+        """Contextualize both documents, one chunk per section group."""
+        chunks = self._chunks(original_doc, amendment_doc)
+        if chunks is None:
+            return self.agent.run(original_doc, amendment_doc, trace)
+        
+        # Each chunk runs in its own copy of this context so its span nests under the trace
+        futures = [
+            self._pool.submit(contextvars.copy_context().run, self.agent.run, *chunk, trace)
+            for chunk in chunks
+        ]
+        results = [future.result() for future in futures]
+        return self._merge(results, original_doc, amendment_doc)
+    
+    async def arun(
+        self,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+        trace: Optional[Any] = None,
+    ) -> ContextualizationResult:
+        """Async variant of ``run``, gathering the chunk calls."""
+        chunks = self._chunks(original_doc, amendment_doc)
+        if chunks is None:
+            return await self.agent.arun(original_doc, amendment_doc, trace)
+        
+        slots = asyncio.Semaphore(self.max_concurrency)
+        
+        async def contextualize(chunk: Tuple[DocumentStructure, DocumentStructure]) -> ContextualizationResult:
+            async with slots:
+                return await self.agent.arun(*chunk, trace)
+        
+        results = await asyncio.gather(*(contextualize(chunk) for chunk in chunks))
+        return self._merge(results, original_doc, amendment_doc)
+    
+    def _chunks(
+        self,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+    ) -> Optional[List[Tuple[DocumentStructure, DocumentStructure]]]:
+        """Split the documents into paired chunks, or None when one call suffices."""
+        if len(original_doc.full_text) + len(amendment_doc.full_text) <= settings.context_max_chars:
+            return None
+        
+        original_parts = split_sections(original_doc)
+        amendment_parts = split_sections(amendment_doc)
+        if not original_parts or not amendment_parts:
+            return None
+        
+        pairs = pair_sections(original_parts, amendment_parts)
+        if len(pairs) <= self.sections_per_chunk:
+            return None
+        
+        groups = [pairs[i:i + self.sections_per_chunk] for i in range(0, len(pairs), self.sections_per_chunk)]
+        return [
+            (
+                _sub_document(original_doc, [original for original, _ in group]),
+                _sub_document(amendment_doc, [amendment for _, amendment in group]),
+            )
+            for group in groups
+        ]
+    
+    @staticmethod
+    def _merge(
+        results: List[ContextualizationResult],
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+    ) -> ContextualizationResult:
+        """Combine the per-chunk mappings into one result over the full documents."""
+        return ContextualizationResult(
+            original_structure=original_doc,
+            amendment_structure=amendment_doc,
+            corresponding_sections=[section for result in results for section in result.corresponding_sections],
+            analysis_notes="\n\n".join(result.analysis_notes for result in results if result.analysis_notes),
+        )
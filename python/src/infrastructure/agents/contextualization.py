@@ -3,24 +3,19 @@ from typing import Optional, Any, List
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field, ValidationError
 
 from src.domain.interfaces import ContextualizationAgent
-from src.domain.models import DocumentStructure, ContextualizationResult
+from src.domain.models import DocumentStructure, ContextualizationResult, SectionCorrespondence
 from src.config.settings import settings
-
-
-class SectionMapping(BaseModel):
-    """Schema for a single section mapping."""
-    original_section: str = Field(description="Section name in the original contract")
-    amendment_section: str = Field(description="Corresponding section in the amendment")
-    status: str = Field(description="Status: modified, added, removed, or unchanged")
+from src.infrastructure.agents.base import ainvoke_batched, callbacks_config, condense_text, prompt_version
+from src.infrastructure.openai_client import get_http_client, get_async_http_client
+from src.infrastructure.rate_limiter import get_rate_limiter, estimate_tokens
 
 
 class ContextualizationOutput(BaseModel):
     """Schema for the contextualization agent output."""
-    corresponding_sections: List[SectionMapping] = Field(
+    corresponding_sections: List[SectionCorrespondence] = Field(
         description="List of section mappings between original and amendment"
     )
     analysis_notes: str = Field(
@@ -40,30 +35,14 @@ Tasks:
 
 Be thorough and precise. Your analysis will be used by Agent 2 to extract specific changes."""
 
-
-class LangChainContextualizationAgent(ContextualizationAgent):
-    """Contextualization agent using LangChain."""
-    
-    def __init__(self, model: Optional[str] = None):
-        """Initialize the agent with LangChain components."""
-        self.model_name = model or settings.model_name
-        self.llm = ChatOpenAI(
-            model=self.model_name,
-            api_key=settings.openai_api_key,
-            temperature=0,
-            max_tokens=4096,
-        )
-        self.parser = JsonOutputParser(pydantic_object=ContextualizationOutput)
-        
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", SYSTEM_PROMPT + "\n\n{format_instructions}"),
-            ("human", """Analyze these two contract documents:
+# Shared with the fused analysis agent, which asks for more than the section mapping
+DOCUMENTS_PROMPT = """Analyze these two contract documents:
 
 ## ORIGINAL CONTRACT
 Title: {original_title}
 Sections: {original_sections}
 
-Full Text:
+Text (condensed):
 {original_text}
 
 ---
@@ -72,15 +51,54 @@ Full Text:
 Title: {amendment_title}
 Sections: {amendment_sections}
 
-Full Text:
+Text (condensed):
 {amendment_text}
 
 ---
 
-Please analyze the structure of both documents and identify corresponding sections."""),
+"""
+
+HUMAN_PROMPT = DOCUMENTS_PROMPT + "Please analyze the structure of both documents and identify corresponding sections."
+
+
+class LangChainContextualizationAgent(ContextualizationAgent):
+    """Contextualization agent using LangChain."""
+    
+    # Overridden by agents that answer for more than Agent 1 in the same call
+    system_prompt = SYSTEM_PROMPT
+    human_prompt = HUMAN_PROMPT
+    output_schema = ContextualizationOutput
+    name = "contextualization"
+    
+    def __init__(self, model: Optional[str] = None, batch: Optional[bool] = None):
+        """
+        Initialize the agent with LangChain components.
+        
+        ``batch`` routes ``arun`` through the Batch API and defaults to
+        settings.openai_batch_enabled.
+        """
+        self.model_name = model or settings.model_name
+        self.batch = settings.openai_batch_enabled if batch is None else batch
+        self.llm = ChatOpenAI(
+            model=self.model_name,
+            api_key=settings.openai_api_key,
+            temperature=0,
+            max_tokens=self._max_tokens(),
+            max_retries=settings.openai_max_retries,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            extra_body={"prompt_cache_key": f"{settings.prompt_cache_key}-{self.name}"},
+        )
+        
+        # Static system prompt first, per-request content last, so the cached prefix is stable
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("human", self.human_prompt),
         ])
         
-        self.chain = self.prompt | self.llm | self.parser
+        # Strict json_schema: the API guarantees schema-conformant output, so the prompt needn't describe it
+        self.chain = self.prompt | self.llm.with_structured_output(self.output_schema, method="json_schema", strict=True)
+        self.version = prompt_version(self.prompt, self.output_schema)
     
     def run(
         self,
@@ -89,46 +107,77 @@ Please analyze the structure of both documents and identify corresponding sectio
         trace: Optional[Any] = None,
     ) -> ContextualizationResult:
         """Contextualize both documents and identify corresponding sections."""
+        inputs = self._inputs(original_doc, amendment_doc)
+        get_rate_limiter().acquire_sync(self._estimated_tokens(inputs))
         
-        # Build callbacks list for Langfuse tracing
-        callbacks = []
-        if trace and hasattr(trace, 'get_langchain_handler'):
-            callbacks.append(trace.get_langchain_handler())
+        try:
+            result = self.chain.invoke(inputs, config=callbacks_config(trace))
+        except Exception as e:
+            raise RuntimeError(f"LangChain agent error: {e}")
         
-        config = {"callbacks": callbacks} if callbacks else {}
+        return self._to_result(result, original_doc, amendment_doc)
+    
+    async def arun(
+        self,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+        trace: Optional[Any] = None,
+    ) -> ContextualizationResult:
+        """Async variant of ``run`` using ``ainvoke``, or the Batch API when enabled."""
+        inputs = self._inputs(original_doc, amendment_doc)
         
         try:
-            result = self.chain.invoke(
-                {
-                    "original_title": original_doc.title,
-                    "original_sections": ', '.join(original_doc.sections),
-                    "original_text": original_doc.full_text,
-                    "amendment_title": amendment_doc.title,
-                    "amendment_sections": ', '.join(amendment_doc.sections),
-                    "amendment_text": amendment_doc.full_text,
-                    "format_instructions": self.parser.get_format_instructions(),
-                },
-                config=config,
-            )
+            if self.batch:
+                result = await ainvoke_batched(self.llm, self.prompt, inputs, self.output_schema)
+            else:
+                await get_rate_limiter().acquire(self._estimated_tokens(inputs))
+                result = await self.chain.ainvoke(inputs, config=callbacks_config(trace))
         except Exception as e:
             raise RuntimeError(f"LangChain agent error: {e}")
         
-        # Convert to list of dicts for compatibility
-        corresponding_sections = [
-            {
-                "original_section": s.get("original_section", "") if isinstance(s, dict) else s.original_section,
-                "amendment_section": s.get("amendment_section", "") if isinstance(s, dict) else s.amendment_section,
-                "status": s.get("status", "modified") if isinstance(s, dict) else s.status,
-            }
-            for s in result.get("corresponding_sections", [])
-        ]
-        
+        return self._to_result(result, original_doc, amendment_doc)
+    
+    def _max_tokens(self) -> int:
+        """Output cap for the chain call."""
+        return settings.contextualization_max_tokens
+    
+    def _inputs(self, original_doc: DocumentStructure, amendment_doc: DocumentStructure) -> dict:
+        """Build the prompt variables for both documents."""
+        return {
+            "original_title": original_doc.title,
+            "original_sections": ', '.join(original_doc.sections),
+            "original_text": self._condense(original_doc),
+            "amendment_title": amendment_doc.title,
+            "amendment_sections": ', '.join(amendment_doc.sections),
+            "amendment_text": self._condense(amendment_doc),
+        }
+    
+    def _condense(self, document: DocumentStructure) -> str:
+        """Cap the document text sent to the model using the configured limits."""
+        return condense_text(
+            document,
+            max_chars_per_section=settings.context_max_chars_per_section,
+            max_total_chars=settings.context_max_chars,
+        )
+    
+    def _estimated_tokens(self, inputs: dict) -> int:
+        """Estimate the token cost of a chain call for the rate limiter."""
+        prompt_chars = len(self.system_prompt) + sum(len(value) for value in inputs.values())
+        return estimate_tokens(prompt_chars, self.llm.max_tokens)
+    
+    def _to_result(
+        self,
+        result: ContextualizationOutput,
+        original_doc: DocumentStructure,
+        amendment_doc: DocumentStructure,
+    ) -> ContextualizationResult:
+        """Build a ContextualizationResult from the schema-validated chain output."""
         try:
             return ContextualizationResult(
                 original_structure=original_doc,
                 amendment_structure=amendment_doc,
-                corresponding_sections=corresponding_sections,
-                analysis_notes=result.get("analysis_notes", ""),
+                corresponding_sections=result.corresponding_sections,
+                analysis_notes=result.analysis_notes,
             )
         except ValidationError as e:
             raise ValueError(f"Invalid contextualization result: {e}")
@@ -1,15 +1,16 @@
 """Extraction agent implementation using LangChain."""
-import json
 from typing import Optional, Any, List
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field, ValidationError
 
 from src.domain.interfaces import ExtractionAgent
 from src.domain.models import ContextualizationResult, ContractChangeResult
 from src.config.settings import settings
+from src.infrastructure.agents.base import ainvoke_batched, callbacks_config, prompt_version
+from src.infrastructure.openai_client import get_http_client, get_async_http_client
+from src.infrastructure.rate_limiter import get_rate_limiter, estimate_tokens
 
 
 class ExtractionOutput(BaseModel):
@@ -40,19 +41,29 @@ Be specific and thorough in your analysis."""
 class LangChainExtractionAgent(ExtractionAgent):
     """Extraction agent using LangChain."""
     
-    def __init__(self, model: Optional[str] = None):
-        """Initialize the agent with LangChain components."""
+    def __init__(self, model: Optional[str] = None, batch: Optional[bool] = None):
+        """
+        Initialize the agent with LangChain components.
+        
+        ``batch`` routes ``arun`` through the Batch API and defaults to
+        settings.openai_batch_enabled.
+        """
         self.model_name = model or settings.model_name
+        self.batch = settings.openai_batch_enabled if batch is None else batch
         self.llm = ChatOpenAI(
             model=self.model_name,
             api_key=settings.openai_api_key,
             temperature=0,
-            max_tokens=4096,
+            max_tokens=settings.extraction_max_tokens,
+            max_retries=settings.openai_max_retries,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            extra_body={"prompt_cache_key": f"{settings.prompt_cache_key}-extraction"},
         )
-        self.parser = JsonOutputParser(pydantic_object=ExtractionOutput)
         
+        # Static system prompt first, per-request content last, so the cached prefix is stable
         self.prompt = ChatPromptTemplate.from_messages([
-            ("system", SYSTEM_PROMPT + "\n\n{format_instructions}"),
+            ("system", SYSTEM_PROMPT),
             ("human", """Using Agent 1's contextual analysis, extract the specific changes between these contracts.
 
 ## AGENT 1's SECTION MAPPING
@@ -61,13 +72,9 @@ class LangChainExtractionAgent(ExtractionAgent):
 ## AGENT 1's ANALYSIS NOTES
 {analysis_notes}
 
-## ORIGINAL CONTRACT SUMMARY
-Title: {original_title}
-Sections: {original_sections}
-
-## AMENDMENT SUMMARY
-Title: {amendment_title}
-Sections: {amendment_sections}
+## DOCUMENTS
+Original: {original_title}
+Amendment: {amendment_title}
 
 ---
 
@@ -77,7 +84,9 @@ Based on Agent 1's analysis, extract:
 3. A detailed summary of the changes and their business/legal implications"""),
         ])
         
-        self.chain = self.prompt | self.llm | self.parser
+        # Strict json_schema: the API guarantees schema-conformant output, so the prompt needn't describe it
+        self.chain = self.prompt | self.llm.with_structured_output(ExtractionOutput, method="json_schema", strict=True)
+        self.version = prompt_version(self.prompt, ExtractionOutput)
     
     def run(
         self,
@@ -85,37 +94,60 @@ Based on Agent 1's analysis, extract:
         trace: Optional[Any] = None,
     ) -> ContractChangeResult:
         """Extract specific changes using Agent 1's contextualization."""
+        inputs = self._inputs(contextualization)
+        get_rate_limiter().acquire_sync(self._estimated_tokens(inputs))
         
-        # Build callbacks list for Langfuse tracing
-        callbacks = []
-        if trace and hasattr(trace, 'get_langchain_handler'):
-            callbacks.append(trace.get_langchain_handler())
-        
-        config = {"callbacks": callbacks} if callbacks else {}
+        try:
+            result = self.chain.invoke(inputs, config=callbacks_config(trace))
+        except Exception as e:
+            raise RuntimeError(f"LangChain agent error: {e}")
         
-        sections_analysis = json.dumps(contextualization.corresponding_sections, indent=2)
+        return self._to_result(result)
+    
+    async def arun(
+        self,
+        contextualization: ContextualizationResult,
+        trace: Optional[Any] = None,
+    ) -> ContractChangeResult:
+        """Async variant of ``run`` using ``ainvoke``, or the Batch API when enabled."""
+        inputs = self._inputs(contextualization)
         
         try:
-            result = self.chain.invoke(
-                {
-                    "sections_analysis": sections_analysis,
-                    "analysis_notes": contextualization.analysis_notes,
-                    "original_title": contextualization.original_structure.title,
-                    "original_sections": ', '.join(contextualization.original_structure.sections),
-                    "amendment_title": contextualization.amendment_structure.title,
-                    "amendment_sections": ', '.join(contextualization.amendment_structure.sections),
-                    "format_instructions": self.parser.get_format_instructions(),
-                },
-                config=config,
-            )
+            if self.batch:
+                result = await ainvoke_batched(self.llm, self.prompt, inputs, ExtractionOutput)
+            else:
+                await get_rate_limiter().acquire(self._estimated_tokens(inputs))
+                result = await self.chain.ainvoke(inputs, config=callbacks_config(trace))
         except Exception as e:
             raise RuntimeError(f"LangChain agent error: {e}")
         
+        return self._to_result(result)
+    
+    def _inputs(self, contextualization: ContextualizationResult) -> dict:
+        """Build the prompt variables from Agent 1's output."""
+        return {
+            # Compact JSON straight from pydantic-core: indentation only costs prompt tokens
+            "sections_analysis": contextualization.corresponding_sections_json,
+            "analysis_notes": contextualization.analysis_notes,
+            # Agent 1's mapping already names every section; the full lists would only repeat it
+            "original_title": contextualization.original_structure.title,
+            "amendment_title": contextualization.amendment_structure.title,
+        }
+    
+    def _estimated_tokens(self, inputs: dict) -> int:
+        """Estimate the token cost of a chain call for the rate limiter."""
+        prompt_chars = len(SYSTEM_PROMPT) + sum(len(value) for value in inputs.values())
+        return estimate_tokens(prompt_chars, self.llm.max_tokens)
+    
+    @staticmethod
+    def _to_result(result: ExtractionOutput) -> ContractChangeResult:
+        """Build a ContractChangeResult from the schema-validated chain output."""
         try:
             return ContractChangeResult(
-                sections_changed=result.get("sections_changed", []) or ["General"],
-                topics_touched=result.get("topics_touched", []) or ["Contract Terms"],
-                summary_of_the_change=result.get("summary_of_the_change", "Changes detected between contracts."),
+                # The schema guarantees the fields, but the model may still return empty lists
+                sections_changed=result.sections_changed or ["General"],
+                topics_touched=result.topics_touched or ["Contract Terms"],
+                summary_of_the_change=result.summary_of_the_change,
             )
         except ValidationError as e:
             raise ValueError(f"Invalid extraction result: {e}")
@@ -1,19 +1,48 @@
 """Factory for creating agent instances."""
+from functools import lru_cache
+from typing import Optional
+
 from src.domain.interfaces import ContextualizationAgent, ExtractionAgent
 from src.infrastructure.agents.contextualization import OpenAIContextualizationAgent
 from src.infrastructure.agents.extraction import OpenAIExtractionAgent
+from src.infrastructure.agents.analysis import LangChainContractAnalysisAgent, FusedExtractionAgent
+from src.infrastructure.agents.chunking import ChunkedContextualizationAgent
 from src.config.settings import settings
 
 
 class AgentFactory:
-    """Factory for creating agent instances."""
+    """
+    Factory for creating agent instances.
+    
+    Agents hold no per-request state, so each is built once per process and
+    shared; building one compiles its prompt, chain and output JSON schema.
+    """
     
     @staticmethod
-    def create_contextualization_agent() -> ContextualizationAgent:
-        """Create a contextualization agent instance."""
-        return OpenAIContextualizationAgent(model=settings.model_name)
+    @lru_cache(maxsize=None)
+    def create_contextualization_agent(batch: Optional[bool] = None) -> ContextualizationAgent:
+        """
+        Return the shared contextualization agent, built on first use.
+        
+        ``batch`` overrides settings.openai_batch_enabled for this agent.
+        """
+        if settings.fused_agents:
+            # Fused calls extract changes per call, which can't be merged across chunks
+            return LangChainContractAnalysisAgent(model=settings.model_name, batch=batch)
+        agent = OpenAIContextualizationAgent(model=settings.model_name, batch=batch)
+        if settings.context_chunk_sections > 0:
+            return ChunkedContextualizationAgent(agent)
+        return agent
     
     @staticmethod
-    def create_extraction_agent() -> ExtractionAgent:
-        """Create an extraction agent instance."""
-        return OpenAIExtractionAgent(model=settings.model_name)
+    @lru_cache(maxsize=None)
+    def create_extraction_agent(batch: Optional[bool] = None) -> ExtractionAgent:
+        """
+        Return the shared extraction agent, built on first use.
+        
+        ``batch`` overrides settings.openai_batch_enabled for this agent.
+        """
+        agent = OpenAIExtractionAgent(model=settings.model_name, batch=batch)
+        if settings.fused_agents:
+            return FusedExtractionAgent(fallback=agent)
+        return agent
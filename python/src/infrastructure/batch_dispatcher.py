@@ -0,0 +1,154 @@
+"""Dispatch chat completions through the OpenAI Batch API."""
+import asyncio
+import logging
+import uuid
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import orjson
+
+from src.config.settings import settings
+from src.infrastructure.openai_client import get_async_openai_client
+
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_URL = "/v1/chat/completions"
+# Batch states after which no more results will arrive
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchDispatcher:
+    """
+    Buffers chat completion requests and submits them as one Batch API job.
+    
+    Each caller awaits its own future; a batch is flushed once it holds
+    ``max_requests`` requests or ``flush_seconds`` after its first request.
+    Batch jobs cost half as much as online calls and don't count against the
+    online rate limits, but may take minutes to complete, so this is only
+    meant for non-interactive workloads.
+    """
+    
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        """Initialize an empty dispatcher."""
+        self.max_requests = max_requests or settings.openai_batch_max_requests
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.openai_batch_flush_seconds
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.openai_batch_poll_seconds
+        self._pending: List[Tuple[str, dict, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+    
+    async def submit(self, body: dict) -> dict:
+        """
+        Queue a chat completion request and wait for its response body.
+        
+        Args:
+            body: Request body as it would be sent to ``/v1/chat/completions``
+        
+        Returns:
+            The chat completion response body
+        
+        Raises:
+            RuntimeError: If the batch or this request failed
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((uuid.uuid4().hex, body, future))
+        
+        if len(self._pending) >= self.max_requests:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_seconds, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        """Hand the buffered requests to a background batch job."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        
+        requests, self._pending = self._pending, []
+        if not requests:
+            return
+        
+        task = asyncio.get_running_loop().create_task(self._run_batch(requests))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, requests: List[Tuple[str, dict, asyncio.Future]]) -> None:
+        """Upload, submit and poll one batch, then resolve every caller's future."""
+        futures = {custom_id: future for custom_id, _, future in requests}
+        try:
+            responses = await self._execute([(custom_id, body) for custom_id, body, _ in requests])
+        except Exception as e:
+            logger.exception("Batch of %d request(s) failed", len(requests))
+            responses = {custom_id: RuntimeError(f"Batch API error: {e}") for custom_id in futures}
+        
+        for custom_id, future in futures.items():
+            if future.done():
+                continue
+            response = responses.get(custom_id, RuntimeError("Batch API returned no result for request"))
+            if isinstance(response, Exception):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+    
+    async def _execute(self, requests: List[Tuple[str, dict]]) -> dict:
+        """Run one batch job and map each ``custom_id`` to its body or error."""
+        client = get_async_openai_client()
+        
+        payload = b"\n".join(
+            orjson.dumps({"custom_id": custom_id, "method": "POST", "url": CHAT_COMPLETIONS_URL, "body": body})
+            for custom_id, body in requests
+        )
+        batch_file = await client.files.create(file=("batch.jsonl", payload), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=CHAT_COMPLETIONS_URL,
+            completion_window="24h",
+        )
+        logger.info("Submitted batch %s with %d request(s)", batch.id, len(requests))
+        
+        while batch.status not in TERMINAL_STATES:
+            await asyncio.sleep(self.poll_seconds)
+            batch = await client.batches.retrieve(batch.id)
+        
+        logger.info("Batch %s finished with status %s", batch.id, batch.status)
+        
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await client.files.content(file_id)
+                results.update(self._parse_results(content.content))
+        
+        if not results:
+            raise RuntimeError(f"batch {batch.id} ended with status {batch.status}")
+        return results
+    
+    @staticmethod
+    def _parse_results(content: bytes) -> dict:
+        """Parse a Batch API output or error file."""
+        results = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                results[record["custom_id"]] = response["body"]
+            else:
+                error = record.get("error") or response.get("body", {}).get("error")
+                results[record["custom_id"]] = RuntimeError(f"Batch API request failed: {error}")
+        return results
+
+
+@lru_cache(maxsize=1)
+def get_batch_dispatcher() -> BatchDispatcher:
+    """Return the process-wide batch dispatcher."""
+    return BatchDispatcher()
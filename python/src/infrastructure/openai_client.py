@@ -0,0 +1,51 @@
+"""Shared HTTP connection pool for OpenAI calls."""
+import importlib.util
+from functools import lru_cache
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+from src.config.settings import settings
+
+
+# Pool limits shared by the parser and both agents
+HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60,
+)
+
+# HTTP/2 multiplexes concurrent parser and agent calls over one TLS connection; needs the h2 package
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Return the process-wide HTTP client used for every OpenAI request."""
+    return httpx.Client(limits=HTTP_LIMITS, http2=HTTP2)
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """Return the process-wide OpenAI SDK client backed by the shared pool."""
+    return OpenAI(
+        api_key=settings.openai_api_key,
+        http_client=get_http_client(),
+        max_retries=settings.openai_max_retries,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client used for OpenAI requests."""
+    return httpx.AsyncClient(limits=HTTP_LIMITS, http2=HTTP2)
+
+
+@lru_cache(maxsize=1)
+def get_async_openai_client() -> AsyncOpenAI:
+    """Return the process-wide async OpenAI SDK client backed by the shared pool."""
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        http_client=get_async_http_client(),
+        max_retries=settings.openai_max_retries,
+    )
@@ -1,43 +1,283 @@
 """Base parser with common functionality."""
+import io
+import mmap
 import os
-import base64
+from contextlib import contextmanager, ExitStack
+from functools import lru_cache
 import requests
-from pathlib import Path
-from typing import Optional, Any
+import pybase64
+from typing import Optional, Any, Iterable, Iterator, Tuple, Union
+from PIL import Image
 from urllib.parse import urlparse
 
-from src.domain.interfaces import ImageParserStrategy
+from src.domain.interfaces import ImageParserStrategy, ImageStore
 from src.domain.models import DocumentStructure
+from src.config.settings import settings
 
 
-def encode_image_base64(image_path: str) -> str:
-    """Encode an image file or URL to base64 string."""
-    # Check if it's a URL
-    if image_path.startswith(('http://', 'https://')):
-        response = requests.get(image_path, timeout=30)
+# Read size for streaming encodes; a multiple of 3 so chunks encode without padding
+B64_CHUNK_SIZE = 57 * 1024
+
+# Files smaller than this are read outright; mapping them costs more than the copy saves
+MMAP_MIN_SIZE = 64 * 1024
+
+# Media types of the image extensions the vision API accepts
+MEDIA_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "webp": "image/webp",
+}
+
+# Already-compressed formats sent unchanged when they fit within image_max_side
+PASSTHROUGH_FORMATS = {"JPEG", "WEBP"}
+
+# Encoded local images kept in memory; each can be tens of MB when preprocessing is off
+IMAGE_CACHE_ENTRIES = 8
+
+# Uploaded local images remembered by path; entries are just object keys
+IMAGE_UPLOAD_CACHE_ENTRIES = 256
+
+
+def _b64encode_chunks(chunks: Iterable[bytes], prefix: bytes = b"") -> str:
+    """
+    Base64-encode a stream of byte chunks without holding the raw bytes in memory.
+    
+    pybase64 dispatches to SIMD (AVX2/NEON) encoders; each chunk stays cache-resident.
+    ``prefix`` (e.g. a data-URL header) is written first, saving a concatenation.
+    """
+    encoded = bytearray(prefix)
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        cut = len(data) - len(data) % 3
+        encoded += pybase64.b64encode(data[:cut])
+        carry = data[cut:]
+    encoded += pybase64.b64encode(carry)
+    return encoded.decode("ascii")
+
+
+def _capped(chunks: Iterable[bytes], max_bytes: int) -> Iterator[bytes]:
+    """Pass chunks through, failing as soon as the running size exceeds ``max_bytes``."""
+    total = 0
+    for chunk in chunks:
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"Image exceeds the {max_bytes // (1024 * 1024)} MB size limit")
+        yield chunk
+
+
+def _is_url(image_path: str) -> bool:
+    """Whether the image reference is an HTTP(S) URL rather than a local path."""
+    return image_path.startswith(('http://', 'https://'))
+
+
+def _max_bytes() -> int:
+    """Configured image size cap in bytes."""
+    return settings.max_image_size_mb * 1024 * 1024
+
+
+def _download_chunks(url: str) -> Iterator[bytes]:
+    """
+    Stream an image URL in chunks.
+    
+    Oversized images are rejected mid-stream, before the rest is downloaded.
+    
+    Raises:
+        ValueError: If the image is larger than ``settings.max_image_size_mb``
+    """
+    with requests.get(url, timeout=30, stream=True) as response:
         response.raise_for_status()
-        return base64.b64encode(response.content).decode("utf-8")
+        yield from _capped(response.iter_content(B64_CHUNK_SIZE), _max_bytes())
+
+
+@contextmanager
+def _file_buffer(path: str) -> Iterator[Union[bytes, mmap.mmap]]:
+    """
+    Expose a local image as a read-only buffer.
+    
+    Large files are memory-mapped so the page cache backs them instead of a
+    bytes copy; small ones are read outright, which is cheaper than a mapping.
+    
+    Raises:
+        ValueError: If the image is empty or larger than ``settings.max_image_size_mb``
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > _max_bytes():
+            raise ValueError(f"Image exceeds the {settings.max_image_size_mb} MB size limit")
+        if size == 0:
+            raise ValueError(f"Image is empty: {path}")
+        if size < MMAP_MIN_SIZE:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                # Encoders walk the mapping once front to back; let the kernel read ahead aggressively
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+
+def encode_image_base64(image_path: str, prefix: bytes = b"") -> str:
+    """Encode an image file or URL to base64 string (after ``prefix``) without an intermediate bytes copy."""
+    if _is_url(image_path):
+        return _b64encode_chunks(_download_chunks(image_path), prefix)
+    
+    with _file_buffer(image_path) as buffer:
+        return (prefix + pybase64.b64encode(buffer)).decode("ascii")
+
+
+def _detail(size: Tuple[int, int]) -> str:
+    """Vision detail level for an image of the given size, unless forced by ``settings.vision_detail_mode``."""
+    if settings.vision_detail_mode:
+        return settings.vision_detail_mode
+    # Small images gain nothing from high-detail tiling, which costs several times the tokens
+    return "low" if max(size) <= settings.image_low_detail_max_side else "high"
+
+
+def _original_detail(image_path: str) -> str:
+    """Vision detail level for an image sent without preprocessing."""
+    if settings.vision_detail_mode or _is_url(image_path):
+        # Remote sizes aren't known before the download; keep high detail there
+        return settings.vision_detail_mode or "high"
+    # Opening only parses the header, the pixels are never decoded
+    with Image.open(image_path) as image:
+        return _detail(image.size)
+
+
+def preprocess_image(image_path: str) -> Tuple[bytes, str, str]:
+    """
+    Downscale an image to fit ``settings.image_max_side`` and re-encode it as WEBP.
+    
+    Scans are usually far larger than the vision model needs, so this shrinks
+    the upload and the base64 payload several times over. JPEG and WEBP images
+    that already fit are passed through untouched, as re-encoding them would
+    cost CPU and quality for little size gain.
+    
+    Returns:
+        The image bytes, their media type and the vision detail level
+    """
+    with ExitStack() as stack:
+        if _is_url(image_path):
+            source = io.BytesIO(b"".join(_download_chunks(image_path)))
+        else:
+            buffer = stack.enter_context(_file_buffer(image_path))
+            # A mapping is already file-like; BytesIO wraps small reads without copying them
+            source = io.BytesIO(buffer) if isinstance(buffer, bytes) else buffer
+        image = stack.enter_context(Image.open(source))
+        
+        max_side = settings.image_max_side
+        if max(image.size) <= max_side and image.format in PASSTHROUGH_FORMATS:
+            # Only the header has been parsed so far; send the original bytes
+            source.seek(0)
+            return source.read(), Image.MIME[image.format], _detail(image.size)
+        
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        image.save(buffer, "WEBP", quality=settings.image_webp_quality, method=4)
+        detail = _detail(image.size)
+    return buffer.getvalue(), "image/webp", detail
+
+
+def _data_url_prefix(media_type: str) -> bytes:
+    """Header of a base64 ``data:`` URL."""
+    return f"data:{media_type};base64,".encode("ascii")
+
+
+def load_image_data_url(image_path: str) -> Tuple[str, str]:
+    """
+    Load an image for a vision request as a ready-to-send ``data:`` URL.
+    
+    Local files are cached by path, mtime and size, so re-parsing the same
+    scan (retries, repeated comparisons) skips the read, the re-encode and
+    the data-URL assembly.
+    
+    Returns:
+        The data URL and the vision detail level. Images are downscaled to
+        WEBP (see ``preprocess_image``) unless ``settings.image_max_side`` is
+        0, in which case they're sent as-is
+    """
+    if _is_url(image_path):
+        return _load_image_data_url(image_path)
+    
+    stat = os.stat(image_path)
+    return _cached_image_data_url(image_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=IMAGE_CACHE_ENTRIES)
+def _cached_image_data_url(path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    """Encode a local image; mtime and size are part of the key so edited files re-encode."""
+    return _load_image_data_url(path)
+
+
+def _load_image_data_url(image_path: str) -> Tuple[str, str]:
+    """Read, optionally downscale, and encode an image as a data URL."""
+    if settings.image_max_side <= 0:
+        prefix = _data_url_prefix(get_image_media_type(image_path))
+        return encode_image_base64(image_path, prefix), _original_detail(image_path)
+    
+    data, media_type, detail = preprocess_image(image_path)
+    return (_data_url_prefix(media_type) + pybase64.b64encode(data)).decode("ascii"), detail
+
+
+def load_image_bytes(image_path: str) -> Tuple[bytes, str, str]:
+    """
+    Load an image for upload, preprocessed the same way as ``load_image_data_url``.
     
-    # Local file
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+    Returns:
+        The image bytes, their media type and the vision detail level
+    """
+    if settings.image_max_side > 0:
+        return preprocess_image(image_path)
+    
+    if _is_url(image_path):
+        data = b"".join(_download_chunks(image_path))
+    else:
+        with _file_buffer(image_path) as buffer:
+            data = bytes(buffer)
+    return data, get_image_media_type(image_path), _original_detail(image_path)
+
+
+def load_image_url(image_path: str, image_store: ImageStore) -> Tuple[str, str]:
+    """
+    Load an image for a vision request as a URL served by ``image_store``.
+    
+    Local files are uploaded once per path, mtime and size; later parses only
+    sign a fresh URL, so retries and repeated comparisons send no image bytes.
+    Remote images are still inlined, as their source URL may not be public.
+    
+    Returns:
+        The image URL and the vision detail level
+    """
+    if _is_url(image_path):
+        return load_image_data_url(image_path)
+    
+    stat = os.stat(image_path)
+    key, detail = _cached_image_upload(image_store, image_path, stat.st_mtime_ns, stat.st_size)
+    return image_store.url(key), detail
+
+
+@lru_cache(maxsize=IMAGE_UPLOAD_CACHE_ENTRIES)
+def _cached_image_upload(image_store: ImageStore, path: str, mtime_ns: int, size: int) -> Tuple[str, str]:
+    """Upload a local image; mtime and size are part of the key so edited files re-upload."""
+    data, media_type, detail = load_image_bytes(path)
+    return image_store.put(data, media_type), detail
 
 
 def get_image_media_type(image_path: str) -> str:
     """Get the media type for an image based on its extension or URL."""
-    # Parse URL to get the path
-    if image_path.startswith(('http://', 'https://')):
-        parsed = urlparse(image_path)
-        path = parsed.path
-    else:
-        path = image_path
-    
-    ext = Path(path).suffix.lower()
-    media_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".gif": "image/gif",
-        ".webp": "image/webp",
-    }
-    return media_types.get(ext, "image/jpeg")
+    if _is_url(image_path):
+        return get_image_media_type_url(image_path)
+    
+    # One dict lookup on the extension, no Path or urlparse objects on the common local-file path
+    _, dot, extension = image_path.rpartition(".")
+    return MEDIA_TYPES.get(extension.lower(), "image/jpeg") if dot else "image/jpeg"
+
+
+def get_image_media_type_url(url: str) -> str:
+    """Get the media type for an image URL from its path, ignoring the query string."""
+    # Presigned links (e.g. S3) carry signatures in the query; only the path has the extension
+    return get_image_media_type(urlparse(url).path)
@@ -1,21 +1,32 @@
 """Factory for creating parser instances."""
-from src.domain.interfaces import ImageParserStrategy
+from functools import lru_cache
+from typing import Optional
+
+from src.domain.interfaces import ImageParserStrategy, ResultCache
 from src.infrastructure.parsers.openai_parser import OpenAIVisionParser
 from src.infrastructure.parsers.mock_parser import MockParser
+from src.infrastructure.repositories.factory import ImageStoreFactory
 from src.config.settings import settings
 
 
 class ParserFactory:
-    """Factory for creating image parser instances."""
+    """
+    Factory for creating image parser instances.
+    
+    Parsers hold no per-request state, so each configuration is built once per
+    process and shared along with its OpenAI client copies and image store.
+    """
     
     @staticmethod
-    def create(parser_type: str = None) -> ImageParserStrategy:
+    @lru_cache(maxsize=None)
+    def create(parser_type: str = None, result_cache: Optional[ResultCache] = None) -> ImageParserStrategy:
         """
-        Create a parser instance based on type.
+        Return the shared parser for a type and cache, built on first use.
         
         Args:
             parser_type: Type of parser ('openai', 'mock'). 
                         Defaults to settings.parser_type.
+            result_cache: Optional cache of parsed documents.
         
         Returns:
             ImageParserStrategy implementation
@@ -23,7 +34,11 @@ class ParserFactory:
         parser_type = parser_type or settings.parser_type
         
         if parser_type == "openai":
-            return OpenAIVisionParser(model=settings.model_name)
+            return OpenAIVisionParser(
+                model=settings.model_name,
+                result_cache=result_cache,
+                image_store=ImageStoreFactory.create(),
+            )
         elif parser_type == "mock":
             return MockParser()
         else:
@@ -3,19 +3,41 @@
 Note: We use the OpenAI SDK directly for vision/multimodal parsing instead of LangChain
 because it provides more reliable handling of image content with newer models like GPT-5.2.
 """
-import json
-from typing import Optional, Any
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Any, List, Tuple
 
-from openai import OpenAI
-from openai import APIError, APIConnectionError, RateLimitError, APITimeoutError
-from pydantic import ValidationError
+import orjson
+from openai import APIError, APIConnectionError, RateLimitError, APITimeoutError, InternalServerError
+from openai.lib._parsing._completions import type_to_response_format_param
+from pydantic import BaseModel, Field, ValidationError
+from tenacity import (
+    RetryCallState,
+    before_sleep_log,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
-from src.domain.interfaces import ImageParserStrategy
+from src.domain.interfaces import ImageParserStrategy, ResultCache, ImageStore
 from src.domain.models import DocumentStructure
-from src.infrastructure.parsers.base import encode_image_base64, get_image_media_type
+from src.infrastructure.parsers.base import load_image_data_url, load_image_url
+from src.infrastructure.openai_client import get_openai_client, get_async_openai_client
+from src.infrastructure.rate_limiter import get_rate_limiter, estimate_tokens, IMAGE_TOKENS, LOW_DETAIL_IMAGE_TOKENS
+from src.infrastructure.repositories.result_cache import source_digest, load_cached, store_cached
 from src.config.settings import settings
 
 
+class DocumentParserOutput(BaseModel):
+    """Schema for the vision parser output."""
+    title: str = Field(description="Document title")
+    sections: List[str] = Field(description="All section headers/titles, in document order")
+    full_text: str = Field(description="Complete extracted text with preserved structure")
+
+
 SYSTEM_PROMPT = """You are a legal document parser. Extract the complete text and structure from the provided contract image.
 
 Your task:
@@ -24,23 +46,130 @@ Your task:
 3. Identify the document title
 4. Maintain the original formatting as much as possible
 
-Return your response in the following JSON format:
-{
-    "title": "Document title",
-    "sections": ["Section 1 Title", "Section 2 Title", ...],
-    "full_text": "Complete extracted text with preserved structure"
-}
-
 Be thorough and accurate. Do not summarize - extract the complete text."""
 
+# Identical on every request; built once rather than per parse
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Strict json_schema: the API guarantees schema-conformant output, so the prompt needn't describe it
+RESPONSE_FORMAT = type_to_response_format_param(DocumentParserOutput)
+
+# Part of the parse cache key, so editing the prompt or schema invalidates cached documents
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode() + orjson.dumps(RESPONSE_FORMAT)).hexdigest()[:12]
+
+logger = logging.getLogger(__name__)
+
+# Transient failures worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+# Upper bound for a single backoff, whether computed or requested via Retry-After
+MAX_RETRY_WAIT_SECONDS = 60
+
+_backoff = wait_random_exponential(multiplier=1, max=MAX_RETRY_WAIT_SECONDS)
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Wait as long as the server's Retry-After asks, else back off exponentially with jitter."""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), MAX_RETRY_WAIT_SECONDS)
+    except (TypeError, ValueError):
+        return _backoff(retry_state)
+
+
+_retrying = retry(
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    wait=_retry_wait,
+    stop=stop_after_attempt(settings.openai_max_retries + 1),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+
+def _api_error(e: APIError) -> RuntimeError:
+    """Translate an OpenAI SDK error into a user-facing RuntimeError."""
+    if isinstance(e, RateLimitError):
+        return RuntimeError(f"OpenAI rate limit exceeded. Please wait and retry. Details: {e}")
+    if isinstance(e, APITimeoutError):
+        return RuntimeError(f"OpenAI API timeout. The image may be too large. Details: {e}")
+    if isinstance(e, APIConnectionError):
+        return RuntimeError(f"Failed to connect to OpenAI API. Check your network. Details: {e}")
+    return RuntimeError(f"OpenAI API error: {e}")
+
+
+def _end_generation(generation: Optional[Any], **fields) -> None:
+    """Update and close the generation span, if there is one."""
+    if generation:
+        generation.update(**fields)
+        generation.end()
+
+
+class StreamedReply:
+    """
+    Accumulates a streamed chat completion.
+    
+    Streaming keeps the connection busy while the long ``full_text`` is
+    generated, so a dropped connection fails (and is retried) mid-generation
+    instead of at the read timeout, and the generation span records when the
+    first token arrived.
+    """
+    
+    def __init__(self):
+        """Initialize an empty reply."""
+        self._content: List[str] = []
+        self._refusal: List[str] = []
+        self.usage: Optional[Any] = None
+        self.first_token_at: Optional[datetime] = None
+    
+    def add(self, chunk: Any) -> None:
+        """Append one stream chunk; the last one carries the usage."""
+        if chunk.usage:
+            self.usage = chunk.usage
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta
+        if delta.content:
+            if self.first_token_at is None:
+                self.first_token_at = datetime.now(timezone.utc)
+            self._content.append(delta.content)
+        if delta.refusal:
+            self._refusal.append(delta.refusal)
+    
+    @property
+    def content(self) -> Optional[str]:
+        """Generated text, or None if the model produced none."""
+        return "".join(self._content) if self._content else None
+    
+    @property
+    def refusal(self) -> Optional[str]:
+        """Refusal message, if the model declined."""
+        return "".join(self._refusal) if self._refusal else None
+
 
 class OpenAIVisionParser(ImageParserStrategy):
     """Image parser using OpenAI GPT Vision models directly."""
     
-    def __init__(self, model: Optional[str] = None):
-        """Initialize the parser."""
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+        image_store: Optional[ImageStore] = None,
+    ):
+        """
+        Initialize the parser.
+        
+        Args:
+            model: Model name, defaults to settings.model_name
+            result_cache: Optional cache of parsed documents, used by ``aparse``
+            image_store: Optional store hosting local images, which are then
+                sent by URL instead of as inline base64
+        """
         self.model = model or settings.model_name
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        # Retries are handled by _retrying, so the SDK's own retries are turned off
+        self.client = get_openai_client().with_options(max_retries=0)
+        self.async_client = get_async_openai_client().with_options(max_retries=0)
+        self.result_cache = result_cache
+        self.image_store = image_store
     
     def parse(
         self,
@@ -49,82 +178,152 @@ class OpenAIVisionParser(ImageParserStrategy):
         trace: Optional[Any] = None,
     ) -> DocumentStructure:
         """Parse a contract image using OpenAI Vision."""
+        request = self._build_request(*self._load_image(image_path), document_type)
+        get_rate_limiter().acquire_sync(self._estimated_tokens(request))
+        generation = self._start_generation(image_path, document_type, trace)
         
-        # Create generation span for LLM call if trace is available
-        generation = None
-        if trace:
-            generation = trace.generation(
-                name=f"parse_{document_type}_llm_call",
-                model=self.model,
-                input_data={"image_path": image_path, "document_type": document_type},
-                metadata={"step": "image_parsing"},
-            )
+        try:
+            reply = self._create(request)
+        except APIError as e:
+            _end_generation(generation, level="ERROR", status_message=str(e))
+            raise _api_error(e)
+        
+        return self._to_document(reply, document_type, generation)
+    
+    async def aparse(
+        self,
+        image_path: str,
+        document_type: str,
+        trace: Optional[Any] = None,
+    ) -> DocumentStructure:
+        """Parse a contract image using the async OpenAI client, reusing cached documents."""
+        cache_key = None
+        if self.result_cache:
+            digest = await asyncio.to_thread(source_digest, image_path)
+            cache_key = f"parse:{PROMPT_VERSION}:{document_type}:{digest}"
+            cached = await load_cached(self.result_cache, cache_key, DocumentStructure)
+            if cached is not None:
+                return cached
         
-        base64_image = encode_image_base64(image_path)
-        media_type = get_image_media_type(image_path)
+        # URL downloads, file reads and uploads block, keep them off the event loop
+        image = await asyncio.to_thread(self._load_image, image_path)
+        request = self._build_request(*image, document_type)
+        await get_rate_limiter().acquire(self._estimated_tokens(request))
+        generation = self._start_generation(image_path, document_type, trace)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": f"Parse this {document_type} contract document. Extract all text and identify the structure.",
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{media_type};base64,{base64_image}",
-                                    "detail": "high",
-                                },
-                            },
-                        ],
-                    },
-                ],
-                response_format={"type": "json_object"},
-                max_completion_tokens=4096,
-            )
-        except RateLimitError as e:
-            raise RuntimeError(f"OpenAI rate limit exceeded. Please wait and retry. Details: {e}")
-        except APITimeoutError as e:
-            raise RuntimeError(f"OpenAI API timeout. The image may be too large. Details: {e}")
-        except APIConnectionError as e:
-            raise RuntimeError(f"Failed to connect to OpenAI API. Check your network. Details: {e}")
+            reply = await self._acreate(request)
         except APIError as e:
-            raise RuntimeError(f"OpenAI API error: {e}")
-        
-        content = response.choices[0].message.content
+            _end_generation(generation, level="ERROR", status_message=str(e))
+            raise _api_error(e)
         
-        # End generation span with output and usage
-        if generation:
-            generation.update(
-                output=content[:500],
-                usage_details={
-                    "input": response.usage.prompt_tokens,
-                    "output": response.usage.completion_tokens,
+        document = self._to_document(reply, document_type, generation)
+        await store_cached(self.result_cache, cache_key, document)
+        return document
+    
+    def _load_image(self, image_path: str) -> Tuple[str, str]:
+        """Image URL and detail level, hosted by the image store when there is one."""
+        if self.image_store:
+            return load_image_url(image_path, self.image_store)
+        return load_image_data_url(image_path)
+    
+    @_retrying
+    def _create(self, request: dict) -> StreamedReply:
+        """Stream the vision reply, retrying transient failures, including ones mid-stream."""
+        reply = StreamedReply()
+        for chunk in self.client.chat.completions.create(**request):
+            reply.add(chunk)
+        return reply
+    
+    @_retrying
+    async def _acreate(self, request: dict) -> StreamedReply:
+        """Async variant of ``_create``."""
+        reply = StreamedReply()
+        async for chunk in await self.async_client.chat.completions.create(**request):
+            reply.add(chunk)
+        return reply
+    
+    def _start_generation(self, image_path: str, document_type: str, trace: Optional[Any]):
+        """Create generation span for the LLM call (after image loading) if trace is available."""
+        if not trace:
+            return None
+        return trace.generation(
+            name=f"parse_{document_type}_llm_call",
+            model=self.model,
+            input_data={"image_path": image_path, "document_type": document_type},
+            metadata={"step": "image_parsing"},
+        )
+    
+    def _build_request(self, image_url: str, detail: str, document_type: str) -> dict:
+        """Build the chat completion arguments for a contract image."""
+        return {
+            "model": self.model,
+            "messages": [
+                SYSTEM_MESSAGE,
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": f"Parse this {document_type} contract document. Extract all text and identify the structure.",
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url,
+                                "detail": detail,
+                            },
+                        },
+                    ],
                 },
-            )
-            generation.end()
+            ],
+            "response_format": RESPONSE_FORMAT,
+            "max_completion_tokens": 4096,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            "extra_body": {"prompt_cache_key": f"{settings.prompt_cache_key}-parser"},
+        }
+    
+    def _estimated_tokens(self, request: dict) -> int:
+        """Estimate the token cost of a parse request for the rate limiter."""
+        image_url = request["messages"][1]["content"][1]["image_url"]
+        image_tokens = LOW_DETAIL_IMAGE_TOKENS if image_url["detail"] == "low" else IMAGE_TOKENS
+        return image_tokens + estimate_tokens(len(SYSTEM_PROMPT), request["max_completion_tokens"])
+    
+    def _to_document(self, reply: StreamedReply, document_type: str, generation: Optional[Any]) -> DocumentStructure:
+        """Close the generation span and validate the LLM response."""
+        content = reply.content
+        usage_details = {
+            "input": reply.usage.prompt_tokens,
+            "output": reply.usage.completion_tokens,
+        } if reply.usage else None
+        
+        if content is None:
+            message = f"LLM refused to parse the document: {reply.refusal}" if reply.refusal else "LLM returned no content"
+            _end_generation(generation, usage_details=usage_details, level="ERROR", status_message=message)
+            raise ValueError(message)
         
         try:
-            parsed = json.loads(content)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse LLM response as JSON: {e}")
+            # pydantic-core validates the JSON bytes directly, no intermediate dict
+            parsed = DocumentParserOutput.model_validate_json(content)
+        except ValidationError as e:
+            _end_generation(generation, usage_details=usage_details, level="ERROR", status_message=str(e))
+            raise ValueError(f"Failed to parse LLM response: {e}")
+        
+        # Report the parsed structure rather than a slice of the raw JSON
+        _end_generation(
+            generation,
+            output={"title": parsed.title, "sections": parsed.sections},
+            usage_details=usage_details,
+            completion_start_time=reply.first_token_at,
+        )
         
         try:
             return DocumentStructure(
-                title=parsed.get("title", "Unknown"),
-                sections=parsed.get("sections", []) or ["General"],
-                full_text=parsed.get("full_text", ""),
+                title=parsed.title or "Unknown",
+                sections=parsed.sections or ["General"],
+                full_text=parsed.full_text,
                 document_type=document_type,
             )
         except ValidationError as e:
             raise ValueError(f"Invalid document structure from LLM: {e}")
-
-
-# Alias for LangChain naming consistency
-LangChainVisionParser = OpenAIVisionParser
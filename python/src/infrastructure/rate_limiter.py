@@ -0,0 +1,88 @@
+"""Client-side rate limiting for OpenAI calls."""
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from src.config.settings import settings
+
+
+# Rough characters-per-token ratio used to estimate prompt size before the call
+CHARS_PER_TOKEN = 4
+# Flat prompt-token estimates for a contract image, by vision detail level
+IMAGE_TOKENS = 1500
+LOW_DETAIL_IMAGE_TOKENS = 85
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate`` tokens per second.
+    
+    Callers reserve tokens up front and sleep off any deficit, so concurrent
+    callers queue in arrival order instead of all retrying at once. State is
+    guarded by a thread lock so async and thread-pool callers can share it.
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, cost: float) -> float:
+        """Take ``cost`` tokens and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Never demand more than a full bucket, or one huge call would wait forever
+            self._tokens -= min(cost, self.burst)
+            return max(-self._tokens / self.rate, 0.0)
+
+
+class OpenAIRateLimiter:
+    """Paces OpenAI calls to stay under the configured requests and tokens per minute."""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """Create one bucket per enabled budget (0 disables it)."""
+        self.requests: Optional[TokenBucket] = (
+            TokenBucket(requests_per_minute / 60, requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens: Optional[TokenBucket] = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        )
+    
+    def _delay(self, tokens: int) -> float:
+        """Reserve one request and ``tokens`` tokens, returning the wait in seconds."""
+        delays = [0.0]
+        if self.requests:
+            delays.append(self.requests.reserve(1))
+        if self.tokens:
+            delays.append(self.tokens.reserve(tokens))
+        return max(delays)
+    
+    async def acquire(self, tokens: int) -> None:
+        """Wait on the event loop until the call fits the budgets."""
+        delay = self._delay(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+    
+    def acquire_sync(self, tokens: int) -> None:
+        """Blocking variant of ``acquire`` for the sync pipeline."""
+        delay = self._delay(tokens)
+        if delay:
+            time.sleep(delay)
+
+
+def estimate_tokens(prompt_chars: int, max_tokens: int) -> int:
+    """Estimate a call's token cost from its prompt length and completion cap."""
+    return prompt_chars // CHARS_PER_TOKEN + max_tokens
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> OpenAIRateLimiter:
+    """Return the process-wide limiter shared by the parser and both agents."""
+    return OpenAIRateLimiter(settings.openai_rpm, settings.openai_tpm)
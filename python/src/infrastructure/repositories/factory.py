@@ -0,0 +1,100 @@
+"""Factories for creating job store, result cache and image store instances."""
+from functools import lru_cache
+from typing import Optional
+
+from src.domain.interfaces import JobStore, ResultCache, ImageStore
+from src.infrastructure.repositories.job_store import RedisJobStore, InMemoryJobStore
+from src.infrastructure.repositories.result_cache import RedisResultCache, InMemoryResultCache
+from src.infrastructure.repositories.image_store import S3ImageStore
+from src.config.settings import settings
+
+
+class JobStoreFactory:
+    """Factory for creating job store instances."""
+    
+    @staticmethod
+    def create(store_type: str = None) -> JobStore:
+        """
+        Create a job store instance based on type.
+        
+        Args:
+            store_type: Type of store ('redis', 'memory').
+                        Defaults to settings.job_store_type.
+        
+        Returns:
+            JobStore implementation
+        """
+        store_type = store_type or settings.job_store_type
+        
+        if store_type == "redis":
+            return RedisJobStore(settings.redis_url, ttl_seconds=settings.job_ttl_seconds)
+        elif store_type == "memory":
+            return InMemoryJobStore()
+        else:
+            raise ValueError(f"Unknown job store type: {store_type}")
+
+
+class ResultCacheFactory:
+    """Factory for creating result cache instances."""
+    
+    @staticmethod
+    def create(cache_type: str = None) -> Optional[ResultCache]:
+        """
+        Create a result cache instance based on type.
+        
+        Args:
+            cache_type: Type of cache ('redis', 'memory', 'none').
+                        Defaults to settings.result_cache_type.
+        
+        Returns:
+            ResultCache implementation, or None when caching is disabled
+        """
+        cache_type = cache_type or settings.result_cache_type
+        
+        if cache_type == "redis":
+            return RedisResultCache(
+                settings.redis_url,
+                ttl_seconds=settings.result_cache_ttl_seconds,
+                namespace=settings.model_name,
+            )
+        elif cache_type == "memory":
+            return InMemoryResultCache()
+        elif cache_type == "none":
+            return None
+        else:
+            raise ValueError(f"Unknown result cache type: {cache_type}")
+
+
+class ImageStoreFactory:
+    """
+    Factory for creating image store instances.
+    
+    Stores are built once per process and shared, so their client's
+    connection pool and the parser's upload cache survive across parsers.
+    """
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def create(store_type: str = None) -> Optional[ImageStore]:
+        """
+        Return the shared image store for a type, built on first use.
+        
+        Args:
+            store_type: Type of store ('s3', 'none').
+                        Defaults to settings.image_store_type.
+        
+        Returns:
+            ImageStore implementation, or None when images are sent inline
+        """
+        store_type = store_type or settings.image_store_type
+        
+        if store_type == "s3":
+            return S3ImageStore(
+                settings.image_store_bucket,
+                prefix=settings.image_store_prefix,
+                url_ttl_seconds=settings.image_store_url_ttl_seconds,
+            )
+        elif store_type == "none":
+            return None
+        else:
+            raise ValueError(f"Unknown image store type: {store_type}")
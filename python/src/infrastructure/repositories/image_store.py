@@ -0,0 +1,47 @@
+"""Image store implementations serving contract images to the vision API."""
+import hashlib
+from typing import Optional, Any
+
+from src.domain.interfaces import ImageStore
+
+
+class S3ImageStore(ImageStore):
+    """
+    S3-backed image store handing out presigned GET URLs.
+    
+    Objects are keyed by content digest, so uploading the same image twice
+    overwrites it in place instead of piling up copies.
+    """
+    
+    def __init__(self, bucket: str, prefix: str = "", url_ttl_seconds: int = 3600, client: Optional[Any] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            bucket: Bucket the images are uploaded to
+            prefix: Key prefix for uploaded images
+            url_ttl_seconds: Lifetime of the presigned URLs
+            client: boto3 S3 client, created from the environment if omitted
+        """
+        if client is None:
+            # boto3 is only needed when this store is configured
+            import boto3
+            client = boto3.client("s3")
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.url_ttl_seconds = url_ttl_seconds
+    
+    def put(self, data: bytes, media_type: str) -> str:
+        """Upload an image under its content digest."""
+        key = f"{self.prefix}{hashlib.sha256(data).hexdigest()}"
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, ContentType=media_type)
+        return key
+    
+    def url(self, key: str) -> str:
+        """Presign a GET URL; signing is local, no request is made."""
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.url_ttl_seconds,
+        )
@@ -0,0 +1,77 @@
+"""Job store implementations for REST API job state and progress."""
+from typing import Optional
+
+import orjson
+import redis.asyncio as redis
+from pydantic_core import to_json
+
+from src.domain.interfaces import JobStore
+
+
+def _encode(fields: dict) -> dict:
+    """Encode hash values as JSON (datetimes and models included)."""
+    return {key: to_json(value).decode() for key, value in fields.items()}
+
+
+def _decode(data: dict) -> dict:
+    """Decode JSON-encoded hash values."""
+    return {key: orjson.loads(value) for key, value in data.items()}
+
+
+class RedisJobStore(JobStore):
+    """Job store backed by Redis hashes that expire after a TTL."""
+    
+    def __init__(self, redis_url: str, ttl_seconds: int = 3600):
+        """Initialize the store with a lazily-connecting Redis client."""
+        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+    
+    async def save(self, job_id: str, fields: dict) -> None:
+        """Set job fields and refresh the expiry window."""
+        await self._hset(f"job:{job_id}", fields)
+    
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Get all job fields."""
+        data = await self.redis.hgetall(f"job:{job_id}")
+        return _decode(data) if data else None
+    
+    async def save_progress(self, job_id: str, progress: dict) -> None:
+        """Set the latest progress fields and refresh the expiry window."""
+        await self._hset(f"job:{job_id}:progress", progress)
+    
+    async def get_progress(self, job_id: str) -> Optional[dict]:
+        """Get the latest progress fields."""
+        data = await self.redis.hgetall(f"job:{job_id}:progress")
+        return _decode(data) if data else None
+    
+    async def _hset(self, key: str, fields: dict) -> None:
+        """Write hash fields and expiry in a single round-trip."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=_encode(fields))
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local job store for development with a single worker."""
+    
+    def __init__(self):
+        """Initialize empty job and progress dicts."""
+        self.jobs: dict = {}
+        self.progress: dict = {}
+    
+    async def save(self, job_id: str, fields: dict) -> None:
+        """Set job fields."""
+        self.jobs.setdefault(job_id, {}).update(fields)
+    
+    async def get(self, job_id: str) -> Optional[dict]:
+        """Get all job fields."""
+        return self.jobs.get(job_id)
+    
+    async def save_progress(self, job_id: str, progress: dict) -> None:
+        """Replace the latest progress fields."""
+        self.progress[job_id] = progress
+    
+    async def get_progress(self, job_id: str) -> Optional[dict]:
+        """Get the latest progress fields."""
+        return self.progress.get(job_id)
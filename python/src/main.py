@@ -1,24 +1,43 @@
-import json
+import asyncio
 import uuid
 import sys
 from pathlib import Path
+from typing import List, TYPE_CHECKING
 
 import typer
-from pydantic import ValidationError
-from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
 
-from src.services.contract_comparison_service import ContractComparisonService
-from src.infrastructure.parsers.factory import ParserFactory
-from src.infrastructure.agents.factory import AgentFactory
 from src.domain.models import ProcessingResult, ContractChangeResult
-from src.tracing import create_trace, flush_traces
 
-load_dotenv()
+if TYPE_CHECKING:
+    from src.services.contract_comparison_service import ContractComparisonService
 
 app = typer.Typer(help="Contract Comparison and Change Extraction Agent")
 
 
-def process_contracts(
+class ManifestEntry(BaseModel):
+    """One line of a compare-batch manifest."""
+    original: str
+    amendment: str
+    id: str | None = None
+
+
+def create_service() -> "ContractComparisonService":
+    """Build the comparison service; parsers and agents are shared per process by their factories."""
+    # Imported here: the OpenAI, LangChain and Langfuse stack takes over a second to load,
+    # which --help and validate never need
+    from src.services.contract_comparison_service import ContractComparisonService
+    from src.infrastructure.parsers.factory import ParserFactory
+    from src.infrastructure.agents.factory import AgentFactory
+    
+    return ContractComparisonService(
+        parser=ParserFactory.create(),
+        contextualization_agent=AgentFactory.create_contextualization_agent(),
+        extraction_agent=AgentFactory.create_extraction_agent(),
+    )
+
+
+async def process_contracts(
     original_image_path: str,
     amendment_image_path: str,
     contract_id: str | None = None,
@@ -26,7 +45,8 @@ def process_contracts(
     """
     Process two contract images and extract changes.
     
-    Uses hierarchical tracing with Langfuse for full observability.
+    Uses hierarchical tracing with Langfuse for full observability. Both
+    images are parsed concurrently on the async OpenAI client.
     
     Args:
         original_image_path: Path to the original contract image
@@ -38,23 +58,14 @@ def process_contracts(
     """
     contract_id = contract_id or str(uuid.uuid4())
     
-    # Initialize service with factories
-    parser = ParserFactory.create()
-    contextualization_agent = AgentFactory.create_contextualization_agent()
-    extraction_agent = AgentFactory.create_extraction_agent()
-    
-    service = ContractComparisonService(
-        parser=parser,
-        contextualization_agent=contextualization_agent,
-        extraction_agent=extraction_agent,
-    )
+    service = create_service()
     
     # Process with service
     typer.echo(f"Processing contracts...")
     typer.echo(f"  Original: {original_image_path}")
     typer.echo(f"  Amendment: {amendment_image_path}")
     
-    result = service.compare(
+    result = await service.compare_async(
         original_image_path=original_image_path,
         amendment_image_path=amendment_image_path,
         contract_id=contract_id,
@@ -95,26 +106,98 @@ def compare(
         typer.echo(f"Error: Amendment not found: {amendment}", err=True)
         raise typer.Exit(1)
     
-    result = process_contracts(
+    result = asyncio.run(process_contracts(
         str(original_path),
         str(amendment_path),
         contract_id,
-    )
+    ))
     
     indent = 2 if pretty else None
-    json_output = result.model_dump_json(indent=indent)
+    # Serialize straight to UTF-8 bytes; the file is written without a str round trip
+    json_output = result.__pydantic_serializer__.to_json(result, indent=indent)
     
     if output:
-        Path(output).write_text(json_output)
+        Path(output).write_bytes(json_output)
         typer.echo(f"Output saved to: {output}")
     else:
         typer.echo("\n--- Result ---")
-        typer.echo(json_output)
+        typer.echo(json_output.decode())
     
     if result.status == "error":
         raise typer.Exit(1)
 
 
+async def process_batch(entries: List[ManifestEntry], concurrency: int) -> List[ProcessingResult]:
+    """
+    Process many contract pairs concurrently on one event loop.
+    
+    At most ``concurrency`` comparisons are in flight; the shared OpenAI rate
+    limiter still paces the calls they make.
+    
+    Returns:
+        One ProcessingResult per entry, in manifest order
+    """
+    service = create_service()
+    slots = asyncio.Semaphore(concurrency)
+    
+    async def compare_one(entry: ManifestEntry) -> ProcessingResult:
+        async with slots:
+            result = await service.compare_async(
+                entry.original,
+                entry.amendment,
+                contract_id=entry.id or str(uuid.uuid4()),
+            )
+        mark = "✓" if result.status == "success" else "✗"
+        typer.echo(f"{mark} {result.contract_id}", err=True)
+        return result
+    
+    return await asyncio.gather(*(compare_one(entry) for entry in entries))
+
+
+@app.command("compare-batch")
+def compare_batch(
+    manifest: str = typer.Argument(..., help="JSONL file with one {original, amendment, id} pair per line"),
+    concurrency: int = typer.Option(8, "--concurrency", "-c", min=1, help="Pairs processed at once"),
+    output: str = typer.Option(None, "--output", "-o", help="Output file path (JSONL)"),
+):
+    """
+    Compare many contract pairs in one run, writing one JSON result per line.
+    
+    Example:
+        python -m src.main compare-batch data/manifest.jsonl -o results.jsonl
+    """
+    path = Path(manifest)
+    
+    if not path.exists():
+        typer.echo(f"Error: Manifest not found: {manifest}", err=True)
+        raise typer.Exit(1)
+    
+    try:
+        entries = [
+            ManifestEntry.model_validate_json(line)
+            for line in path.read_bytes().splitlines()
+            if line.strip()
+        ]
+    except ValidationError as e:
+        typer.echo(f"Error: Invalid manifest: {e}", err=True)
+        raise typer.Exit(1)
+    
+    typer.echo(f"Processing {len(entries)} contract pair(s), {concurrency} at a time...", err=True)
+    results = asyncio.run(process_batch(entries, concurrency))
+    
+    json_output = b"\n".join(result.__pydantic_serializer__.to_json(result) for result in results) + b"\n"
+    if output:
+        Path(output).write_bytes(json_output)
+        typer.echo(f"Output saved to: {output}", err=True)
+    else:
+        sys.stdout.buffer.write(json_output)
+    
+    failed = sum(result.status == "error" for result in results)
+    typer.echo(f"{len(results) - failed} succeeded, {failed} failed", err=True)
+    if failed:
+        raise typer.Exit(1)
+
+
 @app.command()
 def validate(
     json_file: str = typer.Argument(..., help="Path to JSON file to validate"),
@@ -129,8 +212,8 @@ def validate(
         raise typer.Exit(1)
     
     try:
-        data = json.loads(path.read_text())
-        result = ContractChangeResult.model_validate(data)
+        # pydantic-core parses the raw bytes directly, no intermediate dict
+        result = ContractChangeResult.model_validate_json(path.read_bytes())
         typer.echo("✓ Valid ContractChangeResult")
         typer.echo(result.model_dump_json(indent=2))
     except Exception as e:
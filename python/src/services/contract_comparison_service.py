@@ -1,7 +1,10 @@
 """Contract comparison service - core business logic."""
+import time
 import uuid
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Any, Callable
-from datetime import datetime
 
 from src.domain.models import (
     DocumentStructure,
@@ -13,10 +16,71 @@ from src.domain.interfaces import (
     ImageParserStrategy,
     ContextualizationAgent,
     ExtractionAgent,
+    ResultCache,
 )
+from src.infrastructure.repositories.result_cache import content_key, load_cached, store_cached
 from src.tracing import TracingContext, create_trace
 
 
+# Longest document title recorded on a trace span; spans only need enough to identify the document
+SPAN_TITLE_MAX_CHARS = 256
+
+
+def _document_summary(document: DocumentStructure) -> dict:
+    """Span output for a parsed document: its (capped) title and section count."""
+    return {
+        "title": document.title[:SPAN_TITLE_MAX_CHARS],
+        "sections_count": len(document.sections),
+    }
+
+
+def _elapsed_ms(start_ns: int) -> int:
+    """Milliseconds since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - start_ns) // 1_000_000
+
+
+def _ignore_progress(step: str, progress: int, message: str) -> None:
+    """Progress reporter used when the caller passed no callback."""
+
+
+def _progress_reporter(progress_callback: Optional[Callable[[dict], None]]) -> Callable[[str, int, str], None]:
+    """Return a reporter forwarding progress updates to the callback, if any."""
+    if progress_callback is None:
+        return _ignore_progress
+    
+    def report_progress(step: str, progress: int, message: str):
+        """Helper to report progress."""
+        progress_callback({
+            "step": step,
+            "progress": progress,
+            "message": message,
+            "status": "processing",
+        })
+    
+    return report_progress
+
+
+def _trace_metadata(original_image_path: str, amendment_image_path: str, metadata: Optional[dict]) -> dict:
+    """Build the root trace metadata: both inputs plus the caller's metadata."""
+    trace_metadata = {
+        "original_image": original_image_path,
+        "amendment_image": amendment_image_path,
+    }
+    if metadata:
+        trace_metadata.update(metadata)
+    return trace_metadata
+
+
+def _validate_changes(changes: Any, span: Any) -> ContractChangeResult:
+    """Validate Agent 2's output, trusting results that are already validated models."""
+    if isinstance(changes, ContractChangeResult):
+        span.update(output={"validation": "skipped-redundant"})
+        return changes
+    validated = ContractChangeResult.model_validate(changes)
+    span.update(output={"validation": "success", "fields_validated": 3})
+    return validated
+
+
 class ContractComparisonService:
     """
     Service layer for contract comparison.
@@ -30,6 +94,7 @@ class ContractComparisonService:
         parser: ImageParserStrategy,
         contextualization_agent: ContextualizationAgent,
         extraction_agent: ExtractionAgent,
+        result_cache: Optional[ResultCache] = None,
     ):
         """
         Initialize the service with required dependencies.
@@ -38,10 +103,15 @@ class ContractComparisonService:
             parser: Image parser strategy implementation
             contextualization_agent: Agent for document contextualization
             extraction_agent: Agent for change extraction
+            result_cache: Optional cache for results of ``compare_async``
         """
         self.parser = parser
         self.contextualization_agent = contextualization_agent
         self.extraction_agent = extraction_agent
+        self.result_cache = result_cache
+        # Cached outputs are only reused by the agent versions that produced them
+        self._context_prefix = f"context:{contextualization_agent.version}"
+        self._result_prefix = f"result:{contextualization_agent.version}:{extraction_agent.version}"
     
     def compare(
         self,
@@ -65,62 +135,37 @@ class ContractComparisonService:
             ProcessingResult with extracted changes or error
         """
         contract_id = contract_id or str(uuid.uuid4())
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         
-        def report_progress(step: str, progress: int, message: str):
-            """Helper to report progress."""
-            if progress_callback:
-                progress_callback({
-                    "step": step,
-                    "progress": progress,
-                    "message": message,
-                    "status": "processing",
-                })
+        report_progress = _progress_reporter(progress_callback)
         
         with create_trace(
             name="contract_comparison",
             session_id=contract_id,
             contract_pair_id=contract_id,
-            metadata={
-                "original_image": original_image_path,
-                "amendment_image": amendment_image_path,
-                **(metadata or {}),
-            },
+            metadata=_trace_metadata(original_image_path, amendment_image_path, metadata),
         ) as trace:
             try:
-                # Step 1: Parse original contract
-                report_progress("Step 1/5", 10, "Parsing original contract...")
-                with trace.span("parse_original_contract", input_data={"path": original_image_path}) as span:
-                    original_doc = self.parser.parse(
-                        original_image_path,
-                        document_type="original",
-                        trace=trace,
+                # Steps 1-2: Parse both contracts concurrently, they are independent
+                report_progress("Step 1/5", 10, "Parsing original and amendment contracts...")
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    # Each parse runs in its own copy of this context so its span nests under the trace
+                    original_future = pool.submit(
+                        contextvars.copy_context().run,
+                        self._parse_document, original_image_path, "original", trace,
                     )
-                    span.update(output={
-                        "title": original_doc.title,
-                        "sections_count": len(original_doc.sections),
-                    })
-                report_progress("Step 1/5", 20, "Original contract parsed successfully")
-                
-                # Step 2: Parse amendment
-                report_progress("Step 2/5", 30, "Parsing amendment contract...")
-                with trace.span("parse_amendment_contract", input_data={"path": amendment_image_path}) as span:
-                    amendment_doc = self.parser.parse(
-                        amendment_image_path,
-                        document_type="amendment",
-                        trace=trace,
+                    amendment_future = pool.submit(
+                        contextvars.copy_context().run,
+                        self._parse_document, amendment_image_path, "amendment", trace,
                     )
-                    span.update(output={
-                        "title": amendment_doc.title,
-                        "sections_count": len(amendment_doc.sections),
-                    })
-                report_progress("Step 2/5", 40, "Amendment contract parsed successfully")
+                    original_doc, amendment_doc = original_future.result(), amendment_future.result()
+                report_progress("Step 2/5", 40, "Contracts parsed successfully")
                 
                 # Step 3: Contextualization
                 report_progress("Step 3/5", 50, "Contextualizing documents with AI...")
                 with trace.span("agent1_contextualization", input_data={
-                    "original_title": original_doc.title,
-                    "amendment_title": amendment_doc.title,
+                    "original_title": original_doc.title[:SPAN_TITLE_MAX_CHARS],
+                    "amendment_title": amendment_doc.title[:SPAN_TITLE_MAX_CHARS],
                 }) as span:
                     contextualization = self.contextualization_agent.run(
                         original_doc,
@@ -142,26 +187,141 @@ class ContractComparisonService:
                         contextualization,
                         trace=trace,
                     )
-                    span.update(output={
+                    # Shared by reference with the validation span's input
+                    changes_summary = {
                         "sections_changed": changes.sections_changed,
                         "topics_touched": changes.topics_touched,
-                    })
+                    }
+                    span.update(output=changes_summary)
                 report_progress("Step 4/5", 85, "Change extraction complete")
                 
                 # Step 5: Validation
                 report_progress("Step 5/5", 90, "Validating results...")
-                with trace.span("pydantic_validation", input_data={
-                    "sections_changed": changes.sections_changed,
-                    "topics_touched": changes.topics_touched,
+                with trace.span("pydantic_validation", input_data=changes_summary) as span:
+                    validated_changes = _validate_changes(changes, span)
+                
+                processing_time_ms = _elapsed_ms(start_ns)
+                
+                report_progress("Completed", 100, "Processing complete!")
+                
+                # Results are assembled here from already-validated values; skip re-validating them
+                return ProcessingResult.model_construct(
+                    contract_id=contract_id,
+                    status="success",
+                    result=validated_changes,
+                    error=None,
+                    trace_id=trace.trace_id,
+                    processing_time_ms=processing_time_ms,
+                )
+                
+            except Exception as e:
+                processing_time_ms = _elapsed_ms(start_ns)
+                
+                return ProcessingResult.model_construct(
+                    contract_id=contract_id,
+                    status="error",
+                    result=None,
+                    error=str(e),
+                    trace_id=trace.trace_id,
+                    processing_time_ms=processing_time_ms,
+                )
+    
+    async def compare_async(
+        self,
+        original_image_path: str,
+        amendment_image_path: str,
+        contract_id: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        progress_callback: Optional[Callable[[dict], None]] = None,
+    ) -> ProcessingResult:
+        """
+        Async variant of ``compare``.
+        
+        Awaits the parser's and agents' async methods so that many comparisons
+        can be in flight on one event loop without a thread per job. With a
+        result cache, a repeated pair of inputs returns the cached result, and
+        a cached contextualization skips parsing and Agent 1.
+        
+        Args:
+            original_image_path: Path to the original contract image
+            amendment_image_path: Path to the amendment image
+            contract_id: Optional ID for tracking
+            metadata: Optional metadata for tracing
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            ProcessingResult with extracted changes or error
+        """
+        contract_id = contract_id or str(uuid.uuid4())
+        start_ns = time.perf_counter_ns()
+        
+        report_progress = _progress_reporter(progress_callback)
+        
+        cache_key = None
+        if self.result_cache:
+            cache_key = await asyncio.to_thread(content_key, original_image_path, amendment_image_path)
+            cached = await load_cached(self.result_cache, f"{self._result_prefix}:{cache_key}", ContractChangeResult)
+            if cached is not None:
+                report_progress("Completed", 100, "Result loaded from cache")
+                return ProcessingResult.model_construct(
+                    contract_id=contract_id,
+                    status="success",
+                    result=cached,
+                    error=None,
+                    processing_time_ms=_elapsed_ms(start_ns),
+                )
+        
+        with create_trace(
+            name="contract_comparison",
+            session_id=contract_id,
+            contract_pair_id=contract_id,
+            metadata=_trace_metadata(original_image_path, amendment_image_path, metadata),
+        ) as trace:
+            context_write = None
+            try:
+                contextualization = await load_cached(self.result_cache, f"{self._context_prefix}:{cache_key}", ContextualizationResult)
+                if contextualization is None:
+                    contextualization = await self._acontextualize(
+                        original_image_path, amendment_image_path, trace, report_progress
+                    )
+                    # Written while Agent 2 runs instead of delaying its call
+                    context_write = asyncio.create_task(
+                        store_cached(self.result_cache, f"{self._context_prefix}:{cache_key}", contextualization)
+                    )
+                else:
+                    report_progress("Step 3/5", 60, "Contextualization loaded from cache")
+                
+                # Step 4: Extraction
+                report_progress("Step 4/5", 70, "Extracting changes with AI...")
+                with trace.span("agent2_extraction", input_data={
+                    "sections_to_analyze": len(contextualization.corresponding_sections),
                 }) as span:
-                    validated_changes = ContractChangeResult.model_validate(changes.model_dump())
-                    span.update(output={"validation": "success", "fields_validated": 3})
+                    changes = await self.extraction_agent.arun(
+                        contextualization,
+                        trace=trace,
+                    )
+                    # Shared by reference with the validation span's input
+                    changes_summary = {
+                        "sections_changed": changes.sections_changed,
+                        "topics_touched": changes.topics_touched,
+                    }
+                    span.update(output=changes_summary)
+                report_progress("Step 4/5", 85, "Change extraction complete")
+                
+                # Step 5: Validation
+                report_progress("Step 5/5", 90, "Validating results...")
+                with trace.span("pydantic_validation", input_data=changes_summary) as span:
+                    validated_changes = _validate_changes(changes, span)
                 
-                processing_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                await store_cached(self.result_cache, f"{self._result_prefix}:{cache_key}", validated_changes)
+                if context_write is not None:
+                    await context_write
+                
+                processing_time_ms = _elapsed_ms(start_ns)
                 
                 report_progress("Completed", 100, "Processing complete!")
                 
-                return ProcessingResult(
+                return ProcessingResult.model_construct(
                     contract_id=contract_id,
                     status="success",
                     result=validated_changes,
@@ -171,9 +331,12 @@ class ContractComparisonService:
                 )
                 
             except Exception as e:
-                processing_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                processing_time_ms = _elapsed_ms(start_ns)
+                # A failed extraction doesn't invalidate Agent 1's output; keep it for the retry
+                if context_write is not None:
+                    await context_write
                 
-                return ProcessingResult(
+                return ProcessingResult.model_construct(
                     contract_id=contract_id,
                     status="error",
                     result=None,
@@ -181,3 +344,70 @@ class ContractComparisonService:
                     trace_id=trace.trace_id,
                     processing_time_ms=processing_time_ms,
                 )
+    
+    async def _acontextualize(
+        self,
+        original_image_path: str,
+        amendment_image_path: str,
+        trace: TracingContext,
+        report_progress: Callable[[str, int, str], None],
+    ) -> ContextualizationResult:
+        """Parse both documents and run Agent 1 (steps 1-3 of ``compare_async``)."""
+        # Steps 1-2: Parse both contracts concurrently, they are independent
+        report_progress("Step 1/5", 10, "Parsing original and amendment contracts...")
+        original_doc, amendment_doc = await asyncio.gather(
+            self._aparse_document(original_image_path, "original", trace),
+            self._aparse_document(amendment_image_path, "amendment", trace),
+        )
+        report_progress("Step 2/5", 40, "Contracts parsed successfully")
+        
+        # Step 3: Contextualization
+        report_progress("Step 3/5", 50, "Contextualizing documents with AI...")
+        with trace.span("agent1_contextualization", input_data={
+            "original_title": original_doc.title[:SPAN_TITLE_MAX_CHARS],
+            "amendment_title": amendment_doc.title[:SPAN_TITLE_MAX_CHARS],
+        }) as span:
+            contextualization = await self.contextualization_agent.arun(
+                original_doc,
+                amendment_doc,
+                trace=trace,
+            )
+            span.update(output={
+                "corresponding_sections_count": len(contextualization.corresponding_sections),
+                "analysis_notes_length": len(contextualization.analysis_notes),
+            })
+        report_progress("Step 3/5", 60, "Contextualization complete")
+        
+        return contextualization
+    
+    def _parse_document(
+        self,
+        image_path: str,
+        document_type: str,
+        trace: TracingContext,
+    ) -> DocumentStructure:
+        """Parse one contract image inside its own trace span."""
+        with trace.span(f"parse_{document_type}_contract", input_data={"path": image_path}) as span:
+            document = self.parser.parse(
+                image_path,
+                document_type=document_type,
+                trace=trace,
+            )
+            span.update(output=_document_summary(document))
+        return document
+    
+    async def _aparse_document(
+        self,
+        image_path: str,
+        document_type: str,
+        trace: TracingContext,
+    ) -> DocumentStructure:
+        """Async variant of ``_parse_document``."""
+        with trace.span(f"parse_{document_type}_contract", input_data={"path": image_path}) as span:
+            document = await self.parser.aparse(
+                image_path,
+                document_type=document_type,
+                trace=trace,
+            )
+            span.update(output=_document_summary(document))
+        return document
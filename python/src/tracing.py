@@ -1,18 +1,76 @@
-import os
-from datetime import datetime
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional, Any
-from contextlib import contextmanager
 
-from dotenv import load_dotenv
-from langfuse import get_client, propagate_attributes
+from langfuse import Langfuse, propagate_attributes
 from langfuse.langchain import CallbackHandler as LangfuseCallbackHandler
 
-load_dotenv()
+from src.config.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Set when a finished trace is waiting to be flushed; repeated requests coalesce
+_flush_requested = threading.Event()
+
+
+@lru_cache(maxsize=1)
+def get_langfuse() -> Langfuse:
+    """Return the Langfuse client, configured from settings on first use."""
+    return Langfuse(
+        public_key=settings.langfuse_public_key,
+        secret_key=settings.langfuse_secret_key,
+        host=settings.langfuse_host,
+    )
+
+
+def _flush_worker() -> None:
+    """Flush pending traces whenever a flush is requested."""
+    langfuse = get_langfuse()
+    while True:
+        _flush_requested.wait()
+        _flush_requested.clear()
+        try:
+            langfuse.flush()
+        except Exception:
+            logger.exception("Langfuse flush failed")
+
+
+@lru_cache(maxsize=1)
+def _start_flusher() -> threading.Thread:
+    """Start the background flush thread, draining pending traces at exit."""
+    thread = threading.Thread(target=_flush_worker, name="langfuse-flush", daemon=True)
+    thread.start()
+    atexit.register(flush_traces)
+    return thread
+
+
+def request_flush() -> None:
+    """Schedule a background flush without waiting for it."""
+    _start_flusher()
+    _flush_requested.set()
 
 
 class TracingContext:
     """Context manager for hierarchical tracing with Langfuse."""
     
+    # One instance per comparison; fixed slots avoid a per-instance __dict__
+    __slots__ = (
+        "langfuse",
+        "name",
+        "session_id",
+        "contract_pair_id",
+        "timestamp",
+        "metadata",
+        "root_span",
+        "_trace_id",
+        "_span_context",
+        "_attr_context",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -20,11 +78,11 @@ class TracingContext:
         contract_pair_id: Optional[str] = None,
         metadata: Optional[dict] = None,
     ):
-        self.langfuse = get_client()
+        self.langfuse = get_langfuse()
         self.name = name
         self.session_id = session_id
         self.contract_pair_id = contract_pair_id
-        self.timestamp = datetime.utcnow().isoformat()
+        self.timestamp = datetime.now(timezone.utc).isoformat()
         self.metadata = metadata or {}
         self.root_span = None
         self._trace_id = None
@@ -62,7 +120,7 @@ class TracingContext:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """End trace and flush."""
+        """End trace and schedule a background flush."""
         # Update root span with final output if no error
         if exc_type is None:
             self._span_context.update(output={"status": "success"})
@@ -73,19 +131,17 @@ class TracingContext:
         self._attr_context.__exit__(exc_type, exc_val, exc_tb)
         self.root_span.__exit__(exc_type, exc_val, exc_tb)
         
-        # Flush traces
-        self.langfuse.flush()
+        # Flush off the request path; concurrent traces share one flush
+        request_flush()
         return False
     
-    @contextmanager
     def span(self, name: str, input_data: Optional[Any] = None):
-        """Create a child span within the trace."""
-        with self.langfuse.start_as_current_observation(
+        """Create a child span within the trace, as Langfuse's own context manager."""
+        return self.langfuse.start_as_current_observation(
             as_type="span",
             name=name,
             input=input_data,
-        ) as span:
-            yield span
+        )
     
     def generation(
         self,
@@ -109,8 +165,7 @@ class TracingContext:
     
     def get_trace_url(self) -> str:
         """Get the URL to view this trace in Langfuse."""
-        host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
-        return f"{host}/trace/{self._trace_id}" if self._trace_id else None
+        return f"{settings.langfuse_host}/trace/{self._trace_id}" if self._trace_id else None
     
     def get_langchain_handler(self) -> LangfuseCallbackHandler:
         """
@@ -155,6 +210,5 @@ def create_trace(
 
 
 def flush_traces():
-    """Flush all pending traces to Langfuse."""
-    langfuse = get_client()
-    langfuse.flush()
+    """Flush all pending traces to Langfuse, blocking until sent."""
+    get_langfuse().flush()
@@ -1,10 +1,18 @@
-import pytest
-from unittest.mock import Mock, patch, MagicMock
-import json
+import asyncio
+import contextvars
+from unittest.mock import Mock, AsyncMock
 
-from src.domain.models import DocumentStructure, ContextualizationResult, ContractChangeResult
+from src.domain.models import DocumentStructure, ContextualizationResult, ContractChangeResult, SectionCorrespondence
 from src.infrastructure.agents.contextualization import OpenAIContextualizationAgent
 from src.infrastructure.agents.extraction import OpenAIExtractionAgent
+from src.infrastructure.agents.analysis import (
+    ContractAnalysisOutput,
+    FusedExtractionAgent,
+    LangChainContractAnalysisAgent,
+)
+from src.infrastructure.agents.base import condense_text
+from src.infrastructure.agents.chunking import ChunkedContextualizationAgent, pair_sections
+from src.config.settings import settings
 
 
 def create_mock_document(doc_type: str) -> DocumentStructure:
@@ -26,7 +34,7 @@ def create_mock_contextualization() -> ContextualizationResult:
             {
                 "original_section": "2. Terms",
                 "amendment_section": "2. Terms (Amended)",
-                "relationship": "modified",
+                "status": "modified",
             }
         ],
         analysis_notes="The amendment modifies the Terms section.",
@@ -53,7 +61,7 @@ class TestAgentHandoff:
         assert ctx.original_structure.full_text is not None
         assert ctx.amendment_structure.full_text is not None
         
-        sections_json = json.dumps(ctx.corresponding_sections)
+        sections_json = ctx.corresponding_sections_json
         assert "modified" in sections_json
         assert "2. Terms" in sections_json
     
@@ -72,3 +80,134 @@ class TestAgentIntegration:
         agent = OpenAIContextualizationAgent()
         assert hasattr(agent, 'run')
         assert agent is not None
+
+
+class TestCondenseText:
+    """Tests for the document text sent to Agent 1."""
+    
+    def _document(self) -> DocumentStructure:
+        return DocumentStructure(
+            title="Test Contract",
+            sections=["1. Parties", "2. Terms"],
+            full_text="Preamble\n1. Parties\n" + "p" * 50 + "\n2. Terms\n" + "t" * 500,
+            document_type="original",
+        )
+    
+    def test_keeps_headers_and_caps_each_section(self):
+        """Test that every header survives and long sections are cut."""
+        text = condense_text(self._document(), max_chars_per_section=100, max_total_chars=10000)
+        
+        assert "1. Parties\n" + "p" * 50 + "\n" in text
+        assert "2. Terms\n" + "t" * 100 + " [...]" in text
+    
+    def test_shrinks_sections_to_total_cap(self):
+        """Test that the total cap shrinks all sections proportionally."""
+        text = condense_text(self._document(), max_chars_per_section=1000, max_total_chars=200)
+        
+        assert "1. Parties" in text and "2. Terms" in text
+        assert len(text) < 300
+
+
+class TestFusedAnalysis:
+    """Tests for running Agent 1 and Agent 2 as a single call."""
+    
+    def test_one_call_yields_mapping_and_changes(self):
+        """Test the analysis agent attaches the changes and Agent 2 reuses them."""
+        agent = LangChainContractAnalysisAgent()
+        agent.chain = Mock()
+        agent.chain.invoke.return_value = ContractAnalysisOutput(
+            corresponding_sections=[
+                {"original_section": "2. Terms", "amendment_section": "2. Terms", "status": "modified"}
+            ],
+            analysis_notes="The Terms section was modified.",
+            sections_changed=["2. Terms"],
+            topics_touched=["Duration"],
+            summary_of_the_change="The contract term was extended from one year to two years in section 2.",
+        )
+        fallback = Mock()
+        
+        contextualization = agent.run(create_mock_document("original"), create_mock_document("amendment"))
+        changes = FusedExtractionAgent(fallback).run(contextualization)
+        
+        assert contextualization.corresponding_sections[0].status == "modified"
+        assert changes.sections_changed == ["2. Terms"]
+        assert agent.chain.invoke.call_count == 1
+        fallback.run.assert_not_called()
+    
+    def test_falls_back_without_pre_extracted_changes(self):
+        """Test contextualizations from the unfused agent still get Agent 2."""
+        fallback = Mock()
+        contextualization = create_mock_contextualization()
+        
+        FusedExtractionAgent(fallback).run(contextualization)
+        
+        fallback.run.assert_called_once_with(contextualization, None)
+
+
+class TestChunkedContextualization:
+    """Tests for fanning Agent 1 out over section chunks of long contracts."""
+    
+    def _document(self, doc_type: str, sections: list) -> DocumentStructure:
+        return DocumentStructure(
+            title=f"Long {doc_type.title()} Contract",
+            sections=[header for header, _ in sections],
+            full_text="\n".join(f"{header}\n{body}" for header, body in sections),
+            document_type=doc_type,
+        )
+    
+    def test_pairs_follow_content_not_position(self):
+        """Test moved sections are matched and new ones are paired with nothing."""
+        original = [("1. Parties", "acme and beta agree"), ("2. Payment", "net thirty days invoice")]
+        amendment = [
+            ("1. Parties", "acme and beta agree"),
+            ("2. Confidentiality", "secrets stay secret forever"),
+            ("3. Payment", "net sixty days invoice"),
+        ]
+        
+        pairs = pair_sections(original, amendment)
+        
+        assert pairs == [
+            (original[0], amendment[0]),
+            (None, amendment[1]),
+            (original[1], amendment[2]),
+        ]
+    
+    def test_long_documents_are_contextualized_per_chunk(self, monkeypatch):
+        """Test each chunk gets its own call and the mappings are merged."""
+        monkeypatch.setattr(settings, "context_max_chars", 100)
+        sections = [(f"{n}. Clause {n}", f"clause {n} text " * 10) for n in range(1, 5)]
+        original_doc = self._document("original", sections)
+        amendment_doc = self._document("amendment", sections)
+        inner = Mock()
+        inner.arun = AsyncMock(side_effect=lambda original, amendment, trace: ContextualizationResult.model_construct(
+            corresponding_sections=[
+                SectionCorrespondence(original_section=section, amendment_section=section, status="unchanged")
+                for section in original.sections
+            ],
+            analysis_notes=f"{len(original.sections)} sections",
+        ))
+        agent = ChunkedContextualizationAgent(inner, sections_per_chunk=3, max_concurrency=2)
+        
+        result = asyncio.run(agent.arun(original_doc, amendment_doc))
+        
+        # Preamble + 4 clauses in chunks of 3 pairs
+        assert inner.arun.await_count == 2
+        assert [s.original_section for s in result.corresponding_sections] == [h for h, _ in sections]
+        assert result.original_structure is original_doc
+    
+    def test_sync_chunk_calls_inherit_the_callers_context(self, monkeypatch):
+        """Test sync chunk calls see the caller's context variables, as trace spans need."""
+        monkeypatch.setattr(settings, "context_max_chars", 100)
+        sections = [(f"{n}. Clause {n}", f"clause {n} text " * 10) for n in range(1, 5)]
+        current_trace = contextvars.ContextVar("current_trace", default=None)
+        seen = []
+        inner = Mock()
+        inner.run = Mock(side_effect=lambda original, amendment, trace: seen.append(current_trace.get()) or (
+            ContextualizationResult.model_construct(corresponding_sections=[], analysis_notes="")
+        ))
+        agent = ChunkedContextualizationAgent(inner, sections_per_chunk=3, max_concurrency=2)
+        
+        current_trace.set("trace-1")
+        agent.run(self._document("original", sections), self._document("amendment", sections))
+        
+        assert seen == ["trace-1", "trace-1"]
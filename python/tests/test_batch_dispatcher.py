@@ -0,0 +1,67 @@
+import asyncio
+
+import orjson
+import pytest
+
+from src.infrastructure.batch_dispatcher import BatchDispatcher
+
+
+class EchoDispatcher(BatchDispatcher):
+    """Dispatcher that answers each request locally instead of calling the Batch API."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+
+    async def _execute(self, requests):
+        self.batches.append(len(requests))
+        return {
+            custom_id: RuntimeError("rejected") if body.get("fail") else {"echo": body["n"]}
+            for custom_id, body in requests
+        }
+
+
+class TestBatchDispatcher:
+    """Tests for buffering and fan-out of Batch API requests."""
+
+    def test_requests_are_batched_and_fanned_back(self):
+        """Test concurrent callers share one batch and each get their own result."""
+        dispatcher = EchoDispatcher(max_requests=10, flush_seconds=0.01, poll_seconds=0)
+
+        async def run():
+            return await asyncio.gather(
+                *(dispatcher.submit({"n": n}) for n in range(3)),
+                dispatcher.submit({"n": 3, "fail": True}),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert dispatcher.batches == [4]
+        assert results[:3] == [{"echo": 0}, {"echo": 1}, {"echo": 2}]
+        assert isinstance(results[3], RuntimeError)
+
+    def test_full_buffer_flushes_immediately(self):
+        """Test a batch is submitted as soon as it reaches max_requests."""
+        dispatcher = EchoDispatcher(max_requests=2, flush_seconds=60, poll_seconds=0)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(dispatcher.submit({"n": n}) for n in range(4))), timeout=1
+            )
+
+        assert asyncio.run(run()) == [{"echo": n} for n in range(4)]
+        assert dispatcher.batches == [2, 2]
+
+    def test_parse_results_maps_errors(self):
+        """Test output lines map to response bodies and failed lines to errors."""
+        content = b"\n".join([
+            orjson.dumps({"custom_id": "a", "response": {"status_code": 200, "body": {"id": "ok"}}}),
+            orjson.dumps({"custom_id": "b", "response": {"status_code": 400, "body": {"error": {"message": "bad"}}}}),
+        ])
+
+        results = BatchDispatcher._parse_results(content)
+
+        assert results["a"] == {"id": "ok"}
+        with pytest.raises(RuntimeError, match="bad"):
+            raise results["b"]
@@ -0,0 +1,242 @@
+import base64
+import io
+import os
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from openai import BadRequestError, RateLimitError
+from PIL import Image
+
+from src.config.settings import settings
+from src.infrastructure.parsers.base import (
+    B64_CHUNK_SIZE,
+    _b64encode_chunks,
+    encode_image_base64,
+    get_image_media_type,
+    load_image_data_url,
+    load_image_url,
+)
+from src.infrastructure.parsers.openai_parser import OpenAIVisionParser, StreamedReply
+from src.infrastructure.repositories.image_store import S3ImageStore
+
+
+def _stream(*parts):
+    """Chat completion chunks for the given content parts, ending with a usage chunk."""
+    chunks = [Mock(usage=None, choices=[Mock(delta=Mock(content=part, refusal=None))]) for part in parts]
+    return chunks + [Mock(usage=Mock(prompt_tokens=1, completion_tokens=len(parts)), choices=[])]
+
+
+class TestEncodeImageBase64:
+    """Tests for streaming base64 encoding of contract images."""
+
+    def test_file_matches_one_shot_encoding(self, tmp_path):
+        """Test a multi-chunk file encodes the same as encoding it at once."""
+        data = os.urandom(2 * B64_CHUNK_SIZE + 2)
+        image = tmp_path / "contract.png"
+        image.write_bytes(data)
+
+        assert encode_image_base64(str(image)) == base64.b64encode(data).decode()
+
+    def test_small_file_matches_one_shot_encoding(self, tmp_path):
+        """Test files below the mmap threshold are read directly and encode the same."""
+        data = os.urandom(100)
+        image = tmp_path / "contract.png"
+        image.write_bytes(data)
+
+        assert encode_image_base64(str(image)) == base64.b64encode(data).decode()
+
+    def test_unaligned_chunks_are_not_padded_midstream(self):
+        """Test chunk sizes that are not multiples of 3 still encode correctly."""
+        data = os.urandom(1000)
+        chunks = [data[i:i + 7] for i in range(0, len(data), 7)]
+
+        assert _b64encode_chunks(chunks) == base64.b64encode(data).decode()
+
+    def test_oversized_image_is_rejected(self, tmp_path, monkeypatch):
+        """Test images over the size cap raise instead of being encoded."""
+        monkeypatch.setattr(settings, "max_image_size_mb", 1)
+        image = tmp_path / "contract.png"
+        image.write_bytes(b"\0" * (1024 * 1024 + 1))
+
+        with pytest.raises(ValueError, match="1 MB"):
+            encode_image_base64(str(image))
+
+
+class TestGetImageMediaType:
+    """Tests for media type detection from paths and URLs."""
+
+    def test_extension_is_case_insensitive(self):
+        """Test upper-case extensions map like lower-case ones."""
+        assert get_image_media_type("scans/contract.PNG") == "image/png"
+
+    def test_url_query_is_ignored(self):
+        """Test presigned URL parameters don't hide the extension."""
+        url = "https://bucket.s3.amazonaws.com/contract.webp?X-Amz-Signature=abc.png"
+
+        assert get_image_media_type(url) == "image/webp"
+
+    def test_unknown_extension_defaults_to_jpeg(self):
+        """Test files without a known extension are sent as JPEG."""
+        assert get_image_media_type("contract") == "image/jpeg"
+
+
+class TestLoadImageDataUrl:
+    """Tests for downscaling images before upload."""
+
+    def test_large_image_is_downscaled_to_webp(self, tmp_path, monkeypatch):
+        """Test images are shrunk to the configured longest side and sent as WEBP."""
+        monkeypatch.setattr(settings, "image_max_side", 1000)
+        image = tmp_path / "contract.png"
+        Image.new("RGB", (4000, 2000), "white").save(image)
+
+        url, detail = load_image_data_url(str(image))
+        header, payload = url.split(",", 1)
+
+        assert header == "data:image/webp;base64"
+        assert detail == "high"
+        assert Image.open(io.BytesIO(base64.b64decode(payload))).size == (1000, 500)
+
+    def test_fitting_jpeg_is_sent_unchanged(self, tmp_path):
+        """Test compressed images within the max side skip the re-encode."""
+        image = tmp_path / "contract.jpg"
+        Image.new("RGB", (1200, 800), "white").save(image, "JPEG")
+
+        url, detail = load_image_data_url(str(image))
+
+        assert url == "data:image/jpeg;base64," + base64.b64encode(image.read_bytes()).decode()
+        assert detail == "high"
+
+    def test_small_image_uses_low_detail(self, tmp_path):
+        """Test images already below the low-detail threshold skip high-detail tiling."""
+        image = tmp_path / "receipt.png"
+        Image.new("RGB", (600, 400), "white").save(image)
+
+        _, detail = load_image_data_url(str(image))
+
+        assert detail == "low"
+
+    def test_preprocessing_can_be_disabled(self, tmp_path, monkeypatch):
+        """Test a zero max side sends the original bytes unchanged, with detail from the header."""
+        monkeypatch.setattr(settings, "image_max_side", 0)
+        image = tmp_path / "contract.png"
+        Image.new("L", (40, 20)).save(image)
+
+        url, detail = load_image_data_url(str(image))
+
+        assert url == "data:image/png;base64," + base64.b64encode(image.read_bytes()).decode()
+        assert detail == "low"
+
+    def test_detail_can_be_forced(self, tmp_path, monkeypatch):
+        """Test the configured detail mode overrides the size-based choice."""
+        monkeypatch.setattr(settings, "vision_detail_mode", "auto")
+        image = tmp_path / "receipt.png"
+        Image.new("RGB", (600, 400), "white").save(image)
+
+        _, detail = load_image_data_url(str(image))
+
+        assert detail == "auto"
+
+    def test_unchanged_file_is_encoded_once(self, tmp_path):
+        """Test repeated loads of the same file reuse the encoding until it changes."""
+        image = tmp_path / "contract.png"
+        Image.new("RGB", (40, 20), "white").save(image)
+
+        first = load_image_data_url(str(image))
+        assert load_image_data_url(str(image)) is first
+
+        Image.new("RGB", (80, 20), "black").save(image)
+        os.utime(image, ns=(0, 0))
+        assert load_image_data_url(str(image)) != first
+
+
+class TestLoadImageUrl:
+    """Tests for sending local images by hosted URL."""
+
+    def _store(self):
+        client = Mock()
+        client.generate_presigned_url.side_effect = lambda _, Params, ExpiresIn: f"https://s3/{Params['Key']}"
+        return S3ImageStore("contracts", prefix="images/", client=client)
+
+    def test_local_image_is_uploaded_once(self, tmp_path):
+        """Test repeated loads upload the image once and sign a URL for each request."""
+        store = self._store()
+        image = tmp_path / "contract.png"
+        Image.new("RGB", (40, 20), "white").save(image)
+
+        url, detail = load_image_url(str(image), store)
+
+        assert url.startswith("https://s3/images/")
+        assert detail == "low"
+        assert store.client.put_object.call_args.kwargs["ContentType"] == "image/webp"
+        assert load_image_url(str(image), store) == (url, detail)
+        assert store.client.put_object.call_count == 1
+        assert store.client.generate_presigned_url.call_count == 2
+
+    def test_parser_sends_hosted_url(self, tmp_path):
+        """Test the vision request references the stored image instead of inline base64."""
+        image = tmp_path / "contract.png"
+        Image.new("RGB", (40, 20), "white").save(image)
+        parser = OpenAIVisionParser(image_store=self._store())
+
+        request = parser._build_request(*parser._load_image(str(image)), "original")
+
+        assert request["messages"][1]["content"][1]["image_url"]["url"].startswith("https://s3/images/")
+
+
+class TestVisionParserRetries:
+    """Tests for retrying transient OpenAI failures in the vision parser."""
+
+    def _error(self, error_type, status: int):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        response = httpx.Response(status, headers={"retry-after": "0"}, request=request)
+        return error_type("transient", response=response, body=None)
+
+    def test_rate_limits_are_retried(self):
+        """Test 429s are retried, honouring Retry-After, until the call succeeds."""
+        parser = OpenAIVisionParser()
+        parser.client = Mock()
+        rate_limited = self._error(RateLimitError, 429)
+        parser.client.chat.completions.create.side_effect = [rate_limited, rate_limited, _stream("{}")]
+
+        assert parser._create({}).content == "{}"
+        assert parser.client.chat.completions.create.call_count == 3
+
+    def test_client_errors_are_not_retried(self):
+        """Test non-transient errors fail on the first attempt."""
+        parser = OpenAIVisionParser()
+        parser.client = Mock()
+        parser.client.chat.completions.create.side_effect = self._error(BadRequestError, 400)
+
+        with pytest.raises(BadRequestError):
+            parser._create({})
+        assert parser.client.chat.completions.create.call_count == 1
+
+
+class TestVisionParserOutput:
+    """Tests for reading the vision model's streamed structured output."""
+
+    def test_schema_output_becomes_document(self):
+        """Test the streamed JSON reply is reassembled and validated into a document."""
+        parser = OpenAIVisionParser()
+        parser.client = Mock()
+        parser.client.chat.completions.create.return_value = _stream(
+            '{"title": "Lease", "sections": [], ', '"full_text": "This lease is made between..."}'
+        )
+
+        reply = parser._create({})
+        document = parser._to_document(reply, "original", None)
+
+        assert document.title == "Lease"
+        assert document.sections == ["General"]
+        assert document.document_type == "original"
+        assert reply.usage.completion_tokens == 2
+        assert reply.first_token_at is not None
+
+    def test_refusal_is_reported(self):
+        """Test a refusal, which carries no content, raises a ValueError."""
+        reply = StreamedReply()
+        reply.add(Mock(usage=None, choices=[Mock(delta=Mock(content=None, refusal="I can't help"))]))
+
+        with pytest.raises(ValueError, match="refused"):
+            OpenAIVisionParser()._to_document(reply, "original", None)
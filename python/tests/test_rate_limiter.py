@@ -0,0 +1,28 @@
+from src.infrastructure.rate_limiter import OpenAIRateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    """Tests for the client-side OpenAI rate limiter."""
+
+    def test_burst_is_free_then_callers_queue(self):
+        """Test calls within the burst don't wait and later ones wait in turn."""
+        bucket = TokenBucket(rate=1, burst=2)
+
+        assert bucket.reserve(1) == 0
+        assert bucket.reserve(1) == 0
+        assert 0.9 < bucket.reserve(1) <= 1
+        assert 1.9 < bucket.reserve(1) <= 2
+
+    def test_oversized_cost_is_capped_at_burst(self):
+        """Test a call larger than the bucket waits at most one full refill."""
+        bucket = TokenBucket(rate=10, burst=10)
+
+        assert bucket.reserve(1000) == 0
+        assert bucket.reserve(1000) <= 1
+
+    def test_disabled_budgets_never_wait(self):
+        """Test zero budgets turn the limiter off."""
+        limiter = OpenAIRateLimiter(requests_per_minute=0, tokens_per_minute=0)
+
+        limiter.acquire_sync(10_000)
+        assert limiter.requests is None and limiter.tokens is None
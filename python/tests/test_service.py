@@ -0,0 +1,180 @@
+import asyncio
+import threading
+
+from src.domain.interfaces import ContextualizationAgent, ExtractionAgent
+from src.domain.models import ContextualizationResult, ContractChangeResult
+from src.infrastructure.parsers.mock_parser import MockParser
+from src.infrastructure.repositories.result_cache import InMemoryResultCache
+from src.services.contract_comparison_service import ContractComparisonService
+
+
+class StubContextualizationAgent(ContextualizationAgent):
+    """Agent 1 stub returning a fixed section mapping."""
+
+    def run(self, original_doc, amendment_doc, trace=None):
+        return ContextualizationResult(
+            original_structure=original_doc,
+            amendment_structure=amendment_doc,
+            corresponding_sections=[
+                {"original_section": "Section 2", "amendment_section": "Section 2", "status": "modified"}
+            ],
+            analysis_notes="Section 2 was modified.",
+        )
+
+
+class StubExtractionAgent(ExtractionAgent):
+    """Agent 2 stub returning a fixed change result."""
+
+    def run(self, contextualization, trace=None):
+        return ContractChangeResult(
+            sections_changed=["Section 2"],
+            topics_touched=["Payment Terms"],
+            summary_of_the_change="Section 2 changes the payment terms from 30 days to 45 days.",
+        )
+
+
+class RevisedExtractionAgent(StubExtractionAgent):
+    """Agent 2 stub with an edited prompt, counting its calls."""
+
+    version = "revised"
+
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, contextualization, trace=None):
+        self.calls += 1
+        return super().run(contextualization, trace)
+
+
+class ConcurrencyTrackingParser(MockParser):
+    """Mock parser that records how many parses are in flight at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aparse(self, image_path, document_type, trace=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.parse(image_path, document_type, trace)
+
+
+class BarrierParser(MockParser):
+    """Mock parser whose sync parses only complete if both run at the same time."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=1)
+
+    def parse(self, image_path, document_type, trace=None):
+        self.barrier.wait()
+        return super().parse(image_path, document_type, trace)
+
+
+def create_service(result_cache=None) -> ContractComparisonService:
+    """Create a service wired with mock parser and stub agents."""
+    return ContractComparisonService(
+        parser=MockParser(),
+        contextualization_agent=StubContextualizationAgent(),
+        extraction_agent=StubExtractionAgent(),
+        result_cache=result_cache,
+    )
+
+
+class TestContractComparisonService:
+    """Tests for the sync and async comparison pipelines."""
+
+    def test_compare_success(self):
+        """Test the sync pipeline returns a validated result."""
+        result = create_service().compare("original.png", "amendment.png", contract_id="test-1")
+
+        assert result.status == "success"
+        assert result.contract_id == "test-1"
+        assert result.result.sections_changed == ["Section 2"]
+
+    def test_compare_async_matches_sync(self):
+        """Test the async pipeline produces the same result as the sync one."""
+        service = create_service()
+
+        sync_result = service.compare("original.png", "amendment.png", contract_id="test-2")
+        async_result = asyncio.run(
+            service.compare_async("original.png", "amendment.png", contract_id="test-2")
+        )
+
+        assert async_result.status == "success"
+        assert async_result.result == sync_result.result
+
+    def test_compare_async_reports_progress(self):
+        """Test the async pipeline reports progress up to completion."""
+        updates = []
+
+        asyncio.run(
+            create_service().compare_async(
+                "original.png",
+                "amendment.png",
+                progress_callback=updates.append,
+            )
+        )
+
+        assert updates[0]["progress"] == 10
+        assert updates[-1]["progress"] == 100
+
+    def test_compare_reports_progress(self):
+        """Test the sync pipeline reports every step in order when given a callback."""
+        updates = []
+
+        create_service().compare("original.png", "amendment.png", progress_callback=updates.append)
+
+        assert [update["progress"] for update in updates] == [10, 40, 50, 60, 70, 85, 90, 100]
+        assert all(update["status"] == "processing" for update in updates)
+
+    def test_compare_async_serves_repeats_from_cache(self):
+        """Test a repeated pair is answered from the result cache."""
+        cache = InMemoryResultCache()
+        first = asyncio.run(create_service(cache).compare_async("original.png", "amendment.png"))
+
+        service = create_service(cache)
+        service.extraction_agent = None  # any pipeline call would now fail
+        second = asyncio.run(service.compare_async("original.png", "amendment.png"))
+
+        assert second.status == "success"
+        assert second.result == first.result
+        assert {key.split(":")[0] for key in cache.values} == {"context", "result"}
+
+    def test_compare_async_cache_misses_result_after_extraction_prompt_change(self):
+        """Test a revised extraction prompt recomputes the result but reuses the contextualization."""
+        cache = InMemoryResultCache()
+        asyncio.run(create_service(cache).compare_async("original.png", "amendment.png"))
+
+        extraction_agent = RevisedExtractionAgent()
+        service = ContractComparisonService(
+            parser=None,  # any parse would now fail, so Agent 1's output must come from the cache
+            contextualization_agent=StubContextualizationAgent(),
+            extraction_agent=extraction_agent,
+            result_cache=cache,
+        )
+        result = asyncio.run(service.compare_async("original.png", "amendment.png"))
+
+        assert result.status == "success"
+        assert extraction_agent.calls == 1
+        assert sorted(key.split(":")[0] for key in cache.values) == ["context", "result", "result"]
+
+    def test_compare_async_parses_documents_concurrently(self):
+        """Test the original and amendment are parsed at the same time."""
+        service = create_service()
+        service.parser = ConcurrencyTrackingParser()
+
+        result = asyncio.run(service.compare_async("original.png", "amendment.png"))
+
+        assert result.status == "success"
+        assert service.parser.max_in_flight == 2
+
+    def test_compare_parses_documents_concurrently(self):
+        """Test the sync pipeline also parses the original and amendment at the same time."""
+        service = create_service()
+        service.parser = BarrierParser()
+
+        result = service.compare("original.png", "amendment.png")
+
+        assert result.status == "success"
@@ -1,4 +1,8 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
+from functools import lru_cache
 from typing import Callable
 from PIL import Image
 
@@ -18,17 +22,80 @@ class VisualEffect(str, Enum):
         return [e.value for e in cls]
 
 
-def apply_effect(image: Image.Image, effect: VisualEffect) -> Image.Image:
-    """Apply a visual effect to an image."""
+# Fraction of the nominal DPI each effect's source image is rendered at (default 1).
+# A low-res variant keeps less than half the pixels, so it is rendered at half the DPI.
+RENDER_SCALES = {
+    VisualEffect.LOWRES: 0.5,
+}
+
+
+@lru_cache(maxsize=1)
+def _effects() -> dict[VisualEffect, Callable[[Image.Image], Image.Image]]:
+    """Effect implementations by effect, imported on first use since they pull in NumPy."""
     from tools.effects import scanned, photographed, lowres
     
-    if effect == VisualEffect.CLEAN:
-        return image
-    elif effect == VisualEffect.SCANNED:
-        return scanned.apply(image)
-    elif effect == VisualEffect.PHOTOGRAPHED:
-        return photographed.apply(image)
-    elif effect == VisualEffect.LOWRES:
-        return lowres.apply(image)
-    else:
-        return image
+    return {
+        VisualEffect.SCANNED: scanned.apply,
+        VisualEffect.PHOTOGRAPHED: photographed.apply,
+        VisualEffect.LOWRES: lowres.apply,
+    }
+
+
+def apply_effect(image: Image.Image, effect: VisualEffect) -> Image.Image:
+    """Apply a visual effect to an image rendered at the effect's ``RENDER_SCALES`` fraction of the DPI."""
+    apply = _effects().get(effect)
+    return apply(image) if apply else image
+
+
+def seed_worker() -> None:
+    """
+    Reseed a worker process's random, NumPy and Faker state.
+    
+    Forked workers would otherwise share the parent's state and produce
+    identical effects and contracts; used as the pool initializer by both
+    ``apply_batch`` and the contract generator.
+    """
+    import numpy as np
+    from faker import Faker
+    
+    random.seed()
+    np.random.seed()
+    Faker.seed()
+
+
+def _apply_job(job: tuple[Image.Image, VisualEffect]) -> Image.Image:
+    """Worker entry point for ``apply_batch``."""
+    return apply_effect(*job)
+
+
+def apply_batch(
+    jobs: list[tuple[Image.Image, VisualEffect]],
+    workers: int | None = None,
+) -> list[Image.Image]:
+    """
+    Apply visual effects to many images in parallel worker processes.
+    
+    The effects are pure-CPU Pillow/NumPy work that threads can't scale past
+    the GIL. Images travel to the workers as raw pixel buffers, which pickle
+    faster than any encoded format would.
+    
+    Args:
+        jobs: (image, effect) pairs, each image rendered at its effect's RENDER_SCALES fraction of the DPI
+        workers: Worker processes, defaults to the CPU count
+    
+    Returns:
+        The processed images, in job order
+    """
+    pending = [i for i, (_, effect) in enumerate(jobs) if effect != VisualEffect.CLEAN]
+    results = [image for image, _ in jobs]
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        # A pool only adds start-up and pickling cost for a single image or core
+        for i in pending:
+            results[i] = apply_effect(*jobs[i])
+        return results
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=seed_worker) as pool:
+        for i, image in zip(pending, pool.map(_apply_job, [jobs[i] for i in pending])):
+            results[i] = image
+    return results
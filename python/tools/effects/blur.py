@@ -0,0 +1,26 @@
+import numpy as np
+from PIL import Image, ImageFilter
+
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+
+# Modes whose arrays hold pixel values OpenCV can filter directly (not palette indices)
+CV2_MODES = {"L", "RGB", "RGBA"}
+
+
+def gaussian_blur(image: Image.Image, radius: float) -> Image.Image:
+    """
+    Apply a Gaussian blur of the given radius (the Gaussian's sigma).
+    
+    OpenCV runs the blur as two SIMD-vectorized 1D passes, several times faster
+    than Pillow on full-page images; Pillow is the fallback without cv2.
+    """
+    if not HAS_CV2 or image.mode not in CV2_MODES:
+        return image.filter(ImageFilter.GaussianBlur(radius=radius))
+    
+    blurred = cv2.GaussianBlur(np.asarray(image), (0, 0), sigmaX=radius, borderType=cv2.BORDER_REPLICATE)
+    return Image.fromarray(blurred)
@@ -3,31 +3,41 @@ from io import BytesIO
 from PIL import Image
 
 
+# Used for both the downscale and the upscale
+RESAMPLE = Image.Resampling.BILINEAR
+
+
 def apply(image: Image.Image) -> Image.Image:
     """
     Apply low resolution effect.
     
+    The input must already be rendered at ``RENDER_SCALES[VisualEffect.LOWRES]``
+    (half) of the nominal DPI, as ``tools.image_converter`` does: the 0.6-1.0
+    downscale here then keeps 0.3-0.5 of the nominal resolution. A full-DPI
+    input comes out only about half as degraded.
+    
     Effects applied:
     - Reduce resolution (downscale then upscale)
     - JPEG compression artifacts
     - Slight color reduction
     """
-    img = image.copy()
-    original_size = img.size
+    original_size = image.size
     
-    scale_factor = random.uniform(0.3, 0.5)
-    new_size = (int(img.width * scale_factor), int(img.height * scale_factor))
+    scale_factor = random.uniform(0.6, 1.0)
+    new_size = (int(image.width * scale_factor), int(image.height * scale_factor))
     
-    img = img.resize(new_size, Image.Resampling.BILINEAR)
-    img = img.resize(original_size, Image.Resampling.BILINEAR)
+    # Every step but the final upscale runs at the reduced size, like a genuinely
+    # low-res image: only the small image and the output are ever held at once
+    img = image.resize(new_size, RESAMPLE)
     
     quality = random.randint(30, 60)
-    buffer = BytesIO()
-    img.save(buffer, format="JPEG", quality=quality)
-    buffer.seek(0)
-    img = Image.open(buffer).convert("RGB")
+    with BytesIO() as buffer:
+        img.save(buffer, format="JPEG", quality=quality)
+        buffer.seek(0)
+        img = Image.open(buffer).convert("RGB")
     
     if random.random() > 0.5:
-        img = img.quantize(colors=128).convert("RGB")
+        # Fast octree is several times quicker than the default median cut
+        img = img.quantize(colors=128, method=Image.Quantize.FASTOCTREE).convert("RGB")
     
-    return img
+    return img.resize(original_size, RESAMPLE)
@@ -0,0 +1,35 @@
+import numpy as np
+
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+
+def add_gaussian_noise(img_array: np.ndarray, sigma: float) -> np.ndarray:
+    """
+    Add zero-mean Gaussian noise to a uint8 image array, saturating at 0 and 255.
+    
+    With cv2 the noise is drawn straight into an int16 buffer and added with
+    saturating SIMD arithmetic, skipping the float64 draw, the int16 copy of
+    the image and the clip pass of the NumPy fallback.
+    """
+    noise = np.empty(img_array.shape, np.int16)
+    
+    if HAS_CV2:
+        # Follow NumPy's global state, which the batch workers reseed, instead of cv2's fixed default seed
+        cv2.setRNGSeed(int(np.random.randint(2**31)))
+        # Fill through a flat view so every channel gets the same sigma
+        cv2.randn(noise.reshape(-1), 0, sigma)
+        return cv2.add(img_array, noise, dtype=cv2.CV_8U)
+    
+    # A float32 draw from a Generator seeded off NumPy's global state: half the memory of
+    # np.random.normal's float64 samples and faster to produce
+    rng = np.random.default_rng(np.random.randint(2**31))
+    samples = rng.standard_normal(img_array.shape, dtype=np.float32)
+    samples *= sigma
+    noise[...] = samples
+    np.add(noise, img_array, out=noise)
+    np.clip(noise, 0, 255, out=noise)
+    return noise.astype(np.uint8)
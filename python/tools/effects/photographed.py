@@ -1,6 +1,9 @@
 import random
 import numpy as np
-from PIL import Image, ImageFilter, ImageEnhance
+from PIL import Image
+
+from tools.effects.blur import gaussian_blur
+from tools.effects.noise import add_gaussian_noise
 
 try:
     import cv2
@@ -21,34 +24,31 @@ def apply(image: Image.Image) -> Image.Image:
     - Camera noise
     - Shadow on edges
     """
-    img = image.copy()
+    # Every step but the blur works on this one uint8 array, most of them in place
+    img_array = np.array(image)
     
     if HAS_CV2:
-        img = _apply_perspective(img)
+        img_array = _apply_perspective(img_array)
     
-    img = _apply_lighting_gradient(img)
+    _apply_lighting_gradient(img_array)
     
-    img = _apply_color_shift(img)
+    _apply_color_shift(img_array)
     
-    img = img.filter(ImageFilter.GaussianBlur(radius=random.uniform(0.3, 0.8)))
+    img = gaussian_blur(Image.fromarray(img_array), radius=random.uniform(0.3, 0.8))
     
-    img_array = np.array(img)
     noise_intensity = random.uniform(3, 8)
-    noise = np.random.normal(0, noise_intensity, img_array.shape).astype(np.int16)
-    img_array = np.clip(img_array.astype(np.int16) + noise, 0, 255).astype(np.uint8)
-    img = Image.fromarray(img_array)
+    img_array = add_gaussian_noise(np.asarray(img), noise_intensity)
     
-    img = _add_shadow(img)
+    _add_shadow(img_array)
     
-    return img
+    return Image.fromarray(img_array)
 
 
-def _apply_perspective(image: Image.Image) -> Image.Image:
+def _apply_perspective(img_array: np.ndarray) -> np.ndarray:
     """Apply slight perspective transformation."""
     if not HAS_CV2:
-        return image
+        return img_array
     
-    img_array = np.array(image)
     height, width = img_array.shape[:2]
     
     skew = random.uniform(0.02, 0.05)
@@ -68,30 +68,32 @@ def _apply_perspective(image: Image.Image) -> Image.Image:
     ])
     
     matrix = cv2.getPerspectiveTransform(src_points, dst_points)
-    transformed = cv2.warpPerspective(
+    # Each page draws its own skew, so precomputed remap maps would never be reused;
+    # building them per call costs more than warpPerspective's on-the-fly indices
+    return cv2.warpPerspective(
         img_array, matrix, (width, height),
         borderMode=cv2.BORDER_CONSTANT,
         borderValue=(255, 255, 255)
     )
-    
-    return Image.fromarray(transformed)
 
 
-def _apply_lighting_gradient(image: Image.Image) -> Image.Image:
-    """Apply uneven lighting to simulate ambient light."""
-    img_array = np.array(image).astype(np.float32)
+def _apply_lighting_gradient(img_array: np.ndarray) -> None:
+    """Apply uneven lighting to simulate ambient light, in place."""
     height, width = img_array.shape[:2]
     
     gradient_type = random.choice(["corner", "side"])
     
-    y, x = np.mgrid[0:height, 0:width]
+    # Coordinates as a column and a row: they broadcast to the full grid only where needed
+    y = np.arange(height, dtype=np.float32)[:, np.newaxis]
+    x = np.arange(width, dtype=np.float32)[np.newaxis, :]
     
     if gradient_type == "corner":
         corner = random.choice([(0, 0), (0, width), (height, 0), (height, width)])
-        dist = np.sqrt((y - corner[0])**2 + (x - corner[1])**2)
+        dist = np.hypot(y - corner[0], x - corner[1])
         max_dist = np.sqrt(height**2 + width**2)
         gradient = 1 - (dist / max_dist) * random.uniform(0.1, 0.2)
     else:
+        # A single row or column of factors, never expanded to the image size
         side = random.choice(["left", "right", "top", "bottom"])
         if side == "left":
             gradient = 1 - (1 - x / width) * random.uniform(0.1, 0.2)
@@ -102,49 +104,66 @@ def _apply_lighting_gradient(image: Image.Image) -> Image.Image:
         else:
             gradient = 1 - (y / height) * random.uniform(0.1, 0.2)
     
-    gradient = gradient[:, :, np.newaxis]
-    img_array = img_array * gradient
-    img_array = np.clip(img_array, 0, 255).astype(np.uint8)
-    
-    return Image.fromarray(img_array)
+    if not HAS_CV2:
+        # Factors are within (0, 1], so the image is darkened in place without clipping
+        np.multiply(img_array, gradient[:, :, np.newaxis], out=img_array, casting="unsafe")
+        return
+    
+    # Factors as 8-bit fixed point (255 = 1.0): cv2 multiplies uint8 by uint8 with
+    # SIMD and rounding, never materializing a float32 copy of the image
+    factors = np.rint(np.broadcast_to(gradient, (height, width)) * 255).astype(np.uint8)
+    factors = cv2.merge([factors] * img_array.shape[2])
+    cv2.multiply(img_array, factors, dst=img_array, scale=1 / 255, dtype=cv2.CV_8U)
 
 
-def _apply_color_shift(image: Image.Image) -> Image.Image:
-    """Apply slight color temperature shift."""
-    img_array = np.array(image).astype(np.float32)
-    
+def _apply_color_shift(img_array: np.ndarray) -> None:
+    """Apply slight color temperature shift, in place."""
     warm = random.random() > 0.5
     shift_amount = random.uniform(5, 15)
     
     if warm:
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] + shift_amount, 0, 255)
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] - shift_amount * 0.5, 0, 255)
+        red_shift, blue_shift = shift_amount, -shift_amount * 0.5
     else:
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] - shift_amount * 0.5, 0, 255)
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] + shift_amount, 0, 255)
-    
-    return Image.fromarray(img_array.astype(np.uint8))
+        red_shift, blue_shift = -shift_amount * 0.5, shift_amount
+    
+    # Shifted value of every possible level per channel; one lookup pass replaces the float round trip
+    levels = np.arange(256, dtype=np.float32)
+    lut = np.stack([
+        np.clip(levels + red_shift, 0, 255),
+        levels,
+        np.clip(levels + blue_shift, 0, 255),
+    ], axis=1).astype(np.uint8)
+    if HAS_CV2:
+        cv2.LUT(img_array, lut[:, np.newaxis, :], dst=img_array)
+    else:
+        # Green is unchanged, so only the red and blue channels are looked up
+        for channel in (0, 2):
+            img_array[..., channel] = lut[:, channel][img_array[..., channel]]
 
 
-def _add_shadow(image: Image.Image) -> Image.Image:
-    """Add shadow on one or two edges."""
-    img_array = np.array(image).astype(np.float32)
+def _add_shadow(img_array: np.ndarray) -> None:
+    """Add shadow on one or two edges, in place."""
     height, width = img_array.shape[:2]
     
     shadow_width = int(min(width, height) * random.uniform(0.05, 0.1))
     edges = random.sample(["left", "right", "top", "bottom"], k=random.randint(1, 2))
     
+    if shadow_width < 1:
+        return
+    
+    # Brightness factor per pixel from the edge inwards; factors are <= 1, so each
+    # strip is darkened in place in one pass and the rest of the image is never touched
+    ramp = 1 - 0.3 * (1 - np.arange(shadow_width, dtype=np.float32) / shadow_width)
+    channels = (1,) * (img_array.ndim - 2)
+    columns = ramp.reshape(1, -1, *channels)
+    rows = ramp.reshape(-1, 1, *channels)
+    strips = {
+        "left": (img_array[:, :shadow_width], columns),
+        "right": (img_array[:, -shadow_width:], columns[:, ::-1]),
+        "top": (img_array[:shadow_width], rows),
+        "bottom": (img_array[-shadow_width:], rows[::-1]),
+    }
+    
     for edge in edges:
-        for i in range(shadow_width):
-            darkness = 0.3 * (1 - i / shadow_width)
-            
-            if edge == "left":
-                img_array[:, i] *= (1 - darkness)
-            elif edge == "right":
-                img_array[:, -(i+1)] *= (1 - darkness)
-            elif edge == "top":
-                img_array[i, :] *= (1 - darkness)
-            elif edge == "bottom":
-                img_array[-(i+1), :] *= (1 - darkness)
-    
-    return Image.fromarray(np.clip(img_array, 0, 255).astype(np.uint8))
+        strip, factors = strips[edge]
+        np.multiply(strip, factors, out=strip, casting="unsafe")
@@ -1,17 +1,20 @@
-import json
+import os
 import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, List
 
+import orjson
 import typer
 from rich.console import Console
-from rich.prompt import Prompt, IntPrompt, Confirm
+from rich.prompt import Prompt, IntPrompt
 from rich.panel import Panel
 from rich.table import Table
 
-from tools.templates import ContractType, get_template
+from tools.templates import ContractType, get_template, preload
 from tools.templates.base import ContractPair
-from tools.effects import VisualEffect
+from tools.effects import VisualEffect, seed_worker
 from tools.pdf_generator import generate_pdf
 from tools.image_converter import pdf_to_images
 
@@ -120,6 +123,7 @@ def generate_contract_pair(
     generate_pdf_flag: bool,
     generate_images: bool,
     effects: List[VisualEffect],
+    effect_workers: int | None = None,
 ) -> Path:
     """Generate a single contract pair with all outputs."""
     
@@ -138,20 +142,19 @@ def generate_contract_pair(
         console.print(f"    📄 PDFs generated")
     
     if generate_images:
-        if original_pdf is None:
-            original_pdf = generate_pdf(pair.original, contract_dir / ".temp_original.pdf")
-            amendment_pdf = generate_pdf(pair.amendment, contract_dir / ".temp_amendment.pdf")
-        
-        try:
-            pdf_to_images(original_pdf, contract_dir, "contract_original", effects)
-            pdf_to_images(amendment_pdf, contract_dir, "contract_amendment1", effects)
-            console.print(f"    🖼️  Images generated ({len(effects)} variation(s))")
+        # PDFs rendered only to be rasterized go to a scratch directory (usually tmpfs),
+        # removed even when conversion fails, instead of temp files in the output
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            if original_pdf is None:
+                original_pdf = generate_pdf(pair.original, Path(scratch_dir) / "contract_original.pdf")
+                amendment_pdf = generate_pdf(pair.amendment, Path(scratch_dir) / "contract_amendment1.pdf")
             
-            if not generate_pdf_flag:
-                original_pdf.unlink(missing_ok=True)
-                amendment_pdf.unlink(missing_ok=True)
-        except ImportError as e:
-            console.print(f"    [yellow]⚠️  Images not generated: {e}[/yellow]")
+            try:
+                pdf_to_images(original_pdf, contract_dir, "contract_original", effects, workers=effect_workers)
+                pdf_to_images(amendment_pdf, contract_dir, "contract_amendment1", effects, workers=effect_workers)
+                console.print(f"    🖼️  Images generated ({len(effects)} variation(s))")
+            except ImportError as e:
+                console.print(f"    [yellow]⚠️  Images not generated: {e}[/yellow]")
     
     metadata = {
         "contract_type": contract_type.value,
@@ -174,7 +177,7 @@ def generate_contract_pair(
             for c in pair.changes
         ],
     }
-    (contract_dir / "metadata.json").write_text(json.dumps(metadata, indent=2))
+    (contract_dir / "metadata.json").write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
     
     return contract_dir
 
@@ -266,22 +269,58 @@ def generate(
     output_dir = Path(output_dir)
     generated = []
     
-    for i in range(1, selected_quantity + 1):
-        console.print(f"  [cyan]Contract {i}/{selected_quantity}:[/cyan] {selected_type.value}")
+    # Numbers and types are fixed up front so parallel workers can't race for a directory
+    first_num = _get_next_contract_num(output_dir)
+    jobs = [
+        (selected_type if selected_quantity == 1 else ContractType.random(), first_num + i)
+        for i in range(selected_quantity)
+    ]
+    workers = min(os.cpu_count() or 1, selected_quantity)
+    
+    if workers <= 1:
+        for i, (job_type, contract_num) in enumerate(jobs, 1):
+            console.print(f"  [cyan]Contract {i}/{selected_quantity}:[/cyan] {job_type.value}")
+            try:
+                contract_dir = generate_contract_pair(
+                    contract_type=job_type,
+                    output_dir=output_dir,
+                    contract_num=contract_num,
+                    generate_pdf_flag=gen_pdf,
+                    generate_images=gen_images,
+                    effects=selected_effects,
+                )
+                generated.append(contract_dir)
+                console.print(f"    ✓ Created: [green]{contract_dir}[/green]")
+            except Exception as e:
+                console.print(f"    [red]✗ Error: {e}[/red]")
+    else:
+        # Forked workers inherit the loaded templates and Faker data instead of each building their own
+        preload()
         
-        try:
-            contract_dir = generate_contract_pair(
-                contract_type=selected_type if selected_quantity == 1 else ContractType.random(),
-                output_dir=output_dir,
-                contract_num=_get_next_contract_num(output_dir),
-                generate_pdf_flag=gen_pdf,
-                generate_images=gen_images,
-                effects=selected_effects,
-            )
-            generated.append(contract_dir)
-            console.print(f"    ✓ Created: [green]{contract_dir}[/green]")
-        except Exception as e:
-            console.print(f"    [red]✗ Error: {e}[/red]")
+        # Pairs are independent CPU-bound work; each worker applies its effects in-process
+        # rather than nesting another pool per contract
+        with ProcessPoolExecutor(max_workers=workers, initializer=seed_worker) as pool:
+            futures = {
+                pool.submit(
+                    generate_contract_pair,
+                    contract_type=job_type,
+                    output_dir=output_dir,
+                    contract_num=contract_num,
+                    generate_pdf_flag=gen_pdf,
+                    generate_images=gen_images,
+                    effects=selected_effects,
+                    effect_workers=1,
+                ): job_type
+                for job_type, contract_num in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                console.print(f"  [cyan]Contract {done}/{selected_quantity}:[/cyan] {futures[future].value}")
+                try:
+                    contract_dir = future.result()
+                    generated.append(contract_dir)
+                    console.print(f"    ✓ Created: [green]{contract_dir}[/green]")
+                except Exception as e:
+                    console.print(f"    [red]✗ Error: {e}[/red]")
     
     console.print(f"\n[bold green]✓ {len(generated)} contract(s) generated in {output_dir}[/bold green]")
 
@@ -1,5 +1,6 @@
 from pathlib import Path
 from typing import List
+import numpy as np
 from PIL import Image
 
 try:
@@ -8,7 +9,18 @@ try:
 except ImportError:
     HAS_PDF2IMAGE = False
 
-from tools.effects import VisualEffect, apply_effect
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+from tools.effects import RENDER_SCALES, VisualEffect, apply_batch
+
+
+# zlib level for the generated PNGs: still lossless, ~10% larger than the default 6
+# and several times faster to write on noisy images
+PNG_COMPRESSION = 3
 
 
 def pdf_to_images(
@@ -17,6 +29,7 @@ def pdf_to_images(
     base_name: str,
     effects: List[VisualEffect] | None = None,
     dpi: int = 200,
+    workers: int | None = None,
 ) -> List[Path]:
     """
     Convert a PDF to images with optional visual effects.
@@ -26,7 +39,8 @@ def pdf_to_images(
         output_dir: Directory to save images
         base_name: Base name for output files (e.g., "contract_original")
         effects: List of visual effects to apply (generates one image per effect)
-        dpi: Resolution for conversion
+        dpi: Resolution for conversion (some effects render lower, see RENDER_SCALES)
+        workers: Processes applying the effects, defaults to the CPU count
     
     Returns:
         List of paths to generated images
@@ -43,37 +57,68 @@ def pdf_to_images(
     
     effects = effects or [VisualEffect.CLEAN]
     
-    pages = convert_from_path(str(pdf_path), dpi=dpi)
-    
-    if len(pages) == 1:
-        base_image = pages[0]
-    else:
-        total_height = sum(page.height for page in pages)
-        max_width = max(page.width for page in pages)
-        
-        base_image = Image.new('RGB', (max_width, total_height), 'white')
-        y_offset = 0
-        for page in pages:
-            base_image.paste(page, (0, y_offset))
-            y_offset += page.height
+    # Render once per resolution the requested effects need, not always at full DPI
+    effect_dpis = {effect: round(dpi * RENDER_SCALES.get(effect, 1)) for effect in effects}
+    base_images = {
+        render_dpi: _render_pdf(pdf_path, render_dpi)
+        for render_dpi in set(effect_dpis.values())
+    }
     
     output_paths = []
     
-    for effect in effects:
-        processed = apply_effect(base_image, effect)
-        
+    processed_images = apply_batch(
+        [(base_images[effect_dpis[effect]], effect) for effect in effects],
+        workers=workers,
+    )
+    
+    for effect, processed in zip(effects, processed_images):
         if effect == VisualEffect.CLEAN:
             filename = f"{base_name}.png"
         else:
             filename = f"{base_name}_{effect.value}.png"
         
         output_path = output_dir / filename
-        processed.save(output_path, "PNG")
+        _save_png(processed, output_path)
         output_paths.append(output_path)
     
     return output_paths
 
 
+def _render_pdf(pdf_path: Path, dpi: int) -> Image.Image:
+    """Render a PDF at the given DPI, stacking multiple pages vertically."""
+    pages = convert_from_path(str(pdf_path), dpi=dpi)
+    
+    if len(pages) == 1:
+        return pages[0]
+    
+    arrays = [np.asarray(page if page.mode == "RGB" else page.convert("RGB")) for page in pages]
+    max_width = max(array.shape[1] for array in arrays)
+    
+    # Equal-width pages (the usual case) are one contiguous copy with no white fill
+    if all(array.shape[1] == max_width for array in arrays):
+        return Image.fromarray(np.vstack(arrays))
+    
+    stacked = np.full((sum(array.shape[0] for array in arrays), max_width, 3), 255, dtype=np.uint8)
+    y_offset = 0
+    for array in arrays:
+        stacked[y_offset:y_offset + array.shape[0], :array.shape[1]] = array
+        y_offset += array.shape[0]
+    return Image.fromarray(stacked)
+
+
+def _save_png(image: Image.Image, output_path: Path) -> None:
+    """Write an image as PNG at PNG_COMPRESSION, through OpenCV's encoder when available."""
+    if not HAS_CV2 or image.mode not in ("L", "RGB"):
+        image.save(output_path, "PNG", compress_level=PNG_COMPRESSION)
+        return
+    
+    array = np.asarray(image)
+    if image.mode == "RGB":
+        array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+    if not cv2.imwrite(str(output_path), array, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION]):
+        raise RuntimeError(f"Failed to write {output_path}")
+
+
 def create_preview(image_path: Path, max_size: int = 400) -> Image.Image:
     """Create a thumbnail preview of an image."""
     img = Image.open(image_path)
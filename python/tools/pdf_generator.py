@@ -1,13 +1,80 @@
+from functools import lru_cache
 from pathlib import Path
-from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 
 from tools.templates.base import ContractData
 
 
+# Styles are shared, read-only configuration: built once instead of per document
+STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'ContractTitle',
+    parent=STYLES['Heading1'],
+    fontSize=16,
+    spaceAfter=20,
+    alignment=1,
+    fontName='Helvetica-Bold',
+)
+
+SECTION_TITLE_STYLE = ParagraphStyle(
+    'SectionTitle',
+    parent=STYLES['Heading2'],
+    fontSize=12,
+    spaceBefore=15,
+    spaceAfter=8,
+    fontName='Helvetica-Bold',
+)
+
+BODY_STYLE = ParagraphStyle(
+    'ContractBody',
+    parent=STYLES['Normal'],
+    fontSize=10,
+    spaceBefore=0,
+    spaceAfter=10,
+    leading=14,
+    fontName='Helvetica',
+)
+
+PARTY_STYLE = ParagraphStyle(
+    'PartyInfo',
+    parent=STYLES['Normal'],
+    fontSize=10,
+    leftIndent=20,
+    spaceBefore=3,
+    spaceAfter=3,
+    fontName='Helvetica',
+)
+
+SIGNATURE_STYLE = ParagraphStyle(
+    'Signature',
+    parent=STYLES['Normal'],
+    fontSize=10,
+    spaceBefore=30,
+    spaceAfter=5,
+    fontName='Helvetica',
+)
+
+
+@lru_cache(maxsize=1024)
+def _fragments(text: str, style: ParagraphStyle) -> list:
+    """Parsed markup of a paragraph, shared by the many repeats across a batch."""
+    return Paragraph(text, style).frags
+
+
+def _paragraph(text: str, style: ParagraphStyle) -> Paragraph:
+    """
+    Build a paragraph, parsing its markup only the first time the text is seen.
+    
+    Headings, signature lines and most section bodies repeat between an
+    original and its amendment; each call still returns a fresh flowable,
+    since ReportLab keeps layout state on them while building.
+    """
+    return Paragraph(text, style, frags=_fragments(text, style))
+
+
 def generate_pdf(contract: ContractData, output_path: Path) -> Path:
     """
     Generate a PDF document from contract data.
@@ -31,83 +98,34 @@ def generate_pdf(contract: ContractData, output_path: Path) -> Path:
         bottomMargin=72,
     )
     
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'ContractTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=20,
-        alignment=1,
-        fontName='Helvetica-Bold',
-    )
-    
-    section_title_style = ParagraphStyle(
-        'SectionTitle',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceBefore=15,
-        spaceAfter=8,
-        fontName='Helvetica-Bold',
-    )
-    
-    body_style = ParagraphStyle(
-        'ContractBody',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceBefore=0,
-        spaceAfter=10,
-        leading=14,
-        fontName='Helvetica',
-    )
-    
-    party_style = ParagraphStyle(
-        'PartyInfo',
-        parent=styles['Normal'],
-        fontSize=10,
-        leftIndent=20,
-        spaceBefore=3,
-        spaceAfter=3,
-        fontName='Helvetica',
-    )
-    
-    signature_style = ParagraphStyle(
-        'Signature',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceBefore=30,
-        spaceAfter=5,
-        fontName='Helvetica',
-    )
-    
     story = []
     
-    story.append(Paragraph(contract.title, title_style))
+    story.append(_paragraph(contract.title, TITLE_STYLE))
     story.append(Spacer(1, 10))
     
-    story.append(Paragraph(f"<b>Effective Date:</b> {contract.date}", body_style))
+    story.append(_paragraph(f"<b>Effective Date:</b> {contract.date}", BODY_STYLE))
     story.append(Spacer(1, 15))
     
-    story.append(Paragraph("<b>PARTIES</b>", section_title_style))
+    story.append(_paragraph("<b>PARTIES</b>", SECTION_TITLE_STYLE))
     for party_name, party_info in contract.parties.items():
-        story.append(Paragraph(f"<b>{party_name}:</b> {party_info}", party_style))
+        story.append(_paragraph(f"<b>{party_name}:</b> {party_info}", PARTY_STYLE))
     story.append(Spacer(1, 10))
     
     for section in contract.sections:
-        story.append(Paragraph(
+        story.append(_paragraph(
             f"<b>{section.number}. {section.title}</b>",
-            section_title_style
+            SECTION_TITLE_STYLE
         ))
-        story.append(Paragraph(section.content, body_style))
+        story.append(_paragraph(section.content, BODY_STYLE))
     
     story.append(Spacer(1, 30))
-    story.append(Paragraph("<b>SIGNATURES</b>", section_title_style))
+    story.append(_paragraph("<b>SIGNATURES</b>", SECTION_TITLE_STYLE))
     story.append(Spacer(1, 20))
     
     for signature in contract.signatures:
-        story.append(Paragraph("_" * 40, signature_style))
-        story.append(Paragraph(signature, body_style))
-        story.append(Paragraph("Date: _________________", body_style))
+        story.append(_paragraph("_" * 40, SIGNATURE_STYLE))
+        story.append(_paragraph(signature, BODY_STYLE))
+        story.append(_paragraph("Date: _________________", BODY_STYLE))
         story.append(Spacer(1, 20))
     
     doc.build(story)
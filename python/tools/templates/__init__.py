@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 from typing import Callable
 import random
 
@@ -18,14 +19,28 @@ class ContractType(str, Enum):
         return [t.value for t in cls]
 
 
-def get_template(contract_type: ContractType) -> Callable:
-    """Get the template generator function for a contract type."""
+@lru_cache(maxsize=1)
+def _templates() -> dict[ContractType, Callable]:
+    """Template generators by contract type, imported on first use since they pull in Faker."""
     from tools.templates import employment, nda, service, lease
     
-    templates = {
+    return {
         ContractType.EMPLOYMENT: employment.generate,
         ContractType.NDA: nda.generate,
         ContractType.SERVICE: service.generate,
         ContractType.LEASE: lease.generate,
     }
-    return templates[contract_type]
+
+
+def get_template(contract_type: ContractType) -> Callable:
+    """Get the template generator function for a contract type."""
+    return _templates()[contract_type]
+
+
+def preload() -> None:
+    """Import every template and build their Faker data now, e.g. so forked workers inherit them."""
+    from tools.templates import base
+    
+    _templates()
+    base._states()
+    base._cities()
@@ -1,19 +1,75 @@
+import random
 from dataclasses import dataclass, field
-from typing import List
-from faker import Faker
+from datetime import date
+from functools import lru_cache
+from itertools import permutations
+from typing import List, Tuple, TYPE_CHECKING
 
-fake = Faker()
+if TYPE_CHECKING:
+    from faker import Faker
 
+# Cities only appear as flavor text, so a fixed pool of them is plenty of variety
+CITY_POOL_SIZE = 200
 
-@dataclass
+
+@lru_cache(maxsize=1)
+def get_fake() -> "Faker":
+    """Faker instance shared by the templates, created on first use: importing and initializing Faker takes ~80 ms."""
+    from faker import Faker
+    
+    return Faker()
+
+
+@lru_cache(maxsize=1)
+def _states() -> tuple:
+    """US state names, read once from Faker's address provider."""
+    from faker.providers.address.en_US import Provider as AddressProvider
+    
+    return tuple(AddressProvider.states)
+
+
+def random_state() -> str:
+    """A US state, picked straight from Faker's read-only list."""
+    return random.choice(_states())
+
+
+@lru_cache(maxsize=1)
+def _cities() -> tuple:
+    """Pool of city names, generated once per process on first use."""
+    fake = get_fake()
+    return tuple(fake.city() for _ in range(CITY_POOL_SIZE))
+
+
+def random_city() -> str:
+    """A city name from the pool, skipping Faker's per-call name pattern parsing."""
+    return random.choice(_cities())
+
+
+def random_start_date() -> date:
+    """An effective date one to two years ago, without Faker's per-call relative date parsing."""
+    return date.fromordinal(date.today().toordinal() - random.randint(365, 730))
+
+
+MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def format_date(day: date) -> str:
+    """Contract date such as "March 07, 2025", in English whatever the process locale."""
+    return f"{MONTHS[day.month - 1]} {day.day:02d}, {day.year}"
+
+
+@dataclass(frozen=True, slots=True)
 class ContractSection:
-    """Represents a section in a contract."""
+    """Represents a section in a contract. Frozen, so contracts can share sections."""
     number: str
     title: str
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractData:
     """Complete contract data structure."""
     title: str
@@ -50,7 +106,7 @@ class ContractData:
         return "\n".join(lines)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Amendment:
     """Describes changes made in an amendment."""
     section_number: str
@@ -60,7 +116,7 @@ class Amendment:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ContractPair:
     """Original contract and its amendment."""
     original: ContractData
@@ -83,3 +139,65 @@ class ContractPair:
                 lines.append(f"```\n{change.new_content}\n```")
             lines.append("")
         return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def _orderings(options: Tuple[tuple, ...]) -> Tuple[Tuple[tuple, ...], ...]:
+    """Every ordering of a template's (small, fixed) amendable sections."""
+    return tuple(permutations(options))
+
+
+def select_changes(options: Tuple[tuple, ...], num_amendments: int) -> Tuple[tuple, ...]:
+    """
+    Pick the amendable sections an amendment will change.
+    
+    A prefix of a uniformly chosen ordering is a uniform sample without
+    replacement, drawn with one randrange instead of random.sample's bookkeeping.
+    """
+    return random.choice(_orderings(options))[:num_amendments + 1]
+
+
+def amend(
+    original: ContractData,
+    revisions: List[Tuple[int, ContractSection, str]],
+    start_date: date,
+    title: str,
+) -> ContractPair:
+    """
+    Build the amendment of a contract and pair it with the original.
+    
+    Args:
+        original: The original contract
+        revisions: (section index, revised section, change description) per changed section
+        start_date: Effective date of the original; the amendment follows 6-12 months later
+        title: Title of the amendment
+    
+    Returns:
+        The original, its amendment and the list of changes between them
+    """
+    # Sections are frozen, so unchanged ones are shared with the original; changed ones are replaced
+    sections = list(original.sections)
+    changes = []
+    for section_idx, section, description in revisions:
+        changes.append(Amendment(
+            section_number=section.number,
+            change_type="modified",
+            original_content=sections[section_idx].content,
+            new_content=section.content,
+            description=description
+        ))
+        sections[section_idx] = section
+    
+    # Day arithmetic on ordinals skips building a timedelta
+    amendment_date = date.fromordinal(start_date.toordinal() + random.randint(180, 365))
+    
+    amendment = ContractData(
+        title=title,
+        date=format_date(amendment_date),
+        parties=original.parties,
+        sections=sections,
+        signatures=original.signatures,
+        metadata={**original.metadata, "version": "amendment1"}
+    )
+    
+    return ContractPair(original=original, amendment=amendment, changes=changes)
@@ -1,18 +1,29 @@
 import random
-from datetime import datetime, timedelta
-from faker import Faker
 
-from tools.templates.base import ContractData, ContractSection, ContractPair, Amendment
+from tools.templates.base import ContractData, ContractSection, ContractPair, amend, format_date, get_fake, random_city, random_start_date, random_state, select_changes
 
-fake = Faker()
+# Faker providers bound once: calls skip the proxy's attribute dispatch
+fake = get_fake()
+_company = fake.company
+_name = fake.name
+_job = fake.job
+
+
+# Amendable sections: (change type, section number, section title, index into the sections list)
+CHANGE_OPTIONS = (
+    ("salary", "3", "COMPENSATION", 2),
+    ("vacation", "4", "BENEFITS", 3),
+    ("notice", "5", "TERMINATION", 4),
+    ("noncompete", "7", "NON-COMPETE", 6),
+)
 
 
 def generate(num_amendments: int = 1) -> ContractPair:
     """Generate an Employment Agreement with amendments."""
     
-    employer = fake.company()
-    employee = fake.name()
-    start_date = fake.date_between(start_date="-2y", end_date="-1y")
+    employer = _company()
+    employee = _name()
+    start_date = random_start_date()
     
     original_salary = random.randint(50, 150) * 1000
     original_vacation = random.randint(10, 20)
@@ -28,9 +39,9 @@ def generate(num_amendments: int = 1) -> ContractPair:
         ContractSection(
             number="2",
             title="POSITION AND DUTIES",
-            content=f"Employee shall serve as {fake.job()} and shall perform all duties "
+            content=f"Employee shall serve as {_job()} and shall perform all duties "
                     f"as reasonably assigned by the Employer. Employee shall report to "
-                    f"the {fake.job()} and work primarily from {fake.city()}, {fake.state()}."
+                    f"the {_job()} and work primarily from {random_city()}, {random_state()}."
         ),
         ContractSection(
             number="3",
@@ -72,38 +83,24 @@ def generate(num_amendments: int = 1) -> ContractPair:
             number="8",
             title="GOVERNING LAW",
             content=f"This Agreement shall be governed by the laws of the State of "
-                    f"{fake.state()}, without regard to conflicts of law principles."
+                    f"{random_state()}, without regard to conflicts of law principles."
         ),
     ]
     
     original = ContractData(
         title="EMPLOYMENT AGREEMENT",
-        date=start_date.strftime("%B %d, %Y"),
+        date=format_date(start_date),
         parties={
-            "Employer": f"{employer}, a corporation organized under the laws of {fake.state()}",
-            "Employee": f"{employee}, an individual residing in {fake.city()}, {fake.state()}"
+            "Employer": f"{employer}, a corporation organized under the laws of {random_state()}",
+            "Employee": f"{employee}, an individual residing in {random_city()}, {random_state()}"
         },
         sections=original_sections,
         signatures=[f"{employer}, by authorized representative", employee],
         metadata={"type": "employment", "version": "original"}
     )
     
-    changes = []
-    amendment_sections = [ContractSection(s.number, s.title, s.content) for s in original_sections]
-    
-    change_options = [
-        ("salary", "3", "COMPENSATION"),
-        ("vacation", "4", "BENEFITS"),
-        ("notice", "5", "TERMINATION"),
-        ("noncompete", "7", "NON-COMPETE"),
-    ]
-    
-    selected_changes = random.sample(change_options, min(num_amendments + 1, len(change_options)))
-    
-    for change_type, section_num, section_title in selected_changes:
-        section_idx = int(section_num) - 1
-        original_content = amendment_sections[section_idx].content
-        
+    revisions = []
+    for change_type, section_num, section_title, section_idx in select_changes(CHANGE_OPTIONS, num_amendments):
         if change_type == "salary":
             new_salary = original_salary + random.randint(10, 30) * 1000
             new_content = (
@@ -144,25 +141,6 @@ def generate(num_amendments: int = 1) -> ContractPair:
             )
             description = "Non-compete reduced from 12 to 6 months, radius reduced from 50 to 25 miles, added exception for termination without cause"
         
-        amendment_sections[section_idx] = ContractSection(section_num, section_title, new_content)
-        
-        changes.append(Amendment(
-            section_number=section_num,
-            change_type="modified",
-            original_content=original_content,
-            new_content=new_content,
-            description=description
-        ))
-    
-    amendment_date = start_date + timedelta(days=random.randint(180, 365))
-    
-    amendment = ContractData(
-        title="AMENDMENT TO EMPLOYMENT AGREEMENT",
-        date=amendment_date.strftime("%B %d, %Y"),
-        parties=original.parties,
-        sections=amendment_sections,
-        signatures=original.signatures,
-        metadata={"type": "employment", "version": "amendment1"}
-    )
+        revisions.append((section_idx, ContractSection(section_num, section_title, new_content), description))
     
-    return ContractPair(original=original, amendment=amendment, changes=changes)
+    return amend(original, revisions, start_date, "AMENDMENT TO EMPLOYMENT AGREEMENT")
@@ -1,19 +1,30 @@
 import random
-from datetime import datetime, timedelta
-from faker import Faker
 
-from tools.templates.base import ContractData, ContractSection, ContractPair, Amendment
+from tools.templates.base import ContractData, ContractSection, ContractPair, amend, format_date, get_fake, random_city, random_start_date, random_state, select_changes
 
-fake = Faker()
+# Faker providers bound once: calls skip the proxy's attribute dispatch
+fake = get_fake()
+_name = fake.name
+_street_address = fake.street_address
+_zipcode = fake.zipcode
+
+
+# Amendable sections: (change type, section number, section title, index into the sections list)
+CHANGE_OPTIONS = (
+    ("rent", "3", "RENT", 2),
+    ("deposit", "4", "SECURITY DEPOSIT", 3),
+    ("pets", "7", "PETS", 6),
+    ("utilities", "5", "UTILITIES", 4),
+)
 
 
 def generate(num_amendments: int = 1) -> ContractPair:
     """Generate a Lease Agreement with amendments."""
     
-    landlord = fake.name()
-    tenant = fake.name()
-    property_address = f"{fake.street_address()}, {fake.city()}, {fake.state()} {fake.zipcode()}"
-    start_date = fake.date_between(start_date="-2y", end_date="-1y")
+    landlord = _name()
+    tenant = _name()
+    property_address = f"{_street_address()}, {random_city()}, {random_state()} {_zipcode()}"
+    start_date = random_start_date()
     
     original_rent = random.randint(1500, 4000)
     original_deposit = original_rent * 2
@@ -78,7 +89,7 @@ def generate(num_amendments: int = 1) -> ContractPair:
     
     original = ContractData(
         title="RESIDENTIAL LEASE AGREEMENT",
-        date=start_date.strftime("%B %d, %Y"),
+        date=format_date(start_date),
         parties={
             "Landlord": f"{landlord}, an individual",
             "Tenant": f"{tenant}, an individual"
@@ -88,22 +99,8 @@ def generate(num_amendments: int = 1) -> ContractPair:
         metadata={"type": "lease", "version": "original"}
     )
     
-    changes = []
-    amendment_sections = [ContractSection(s.number, s.title, s.content) for s in original_sections]
-    
-    change_options = [
-        ("rent", "3", "RENT"),
-        ("deposit", "4", "SECURITY DEPOSIT"),
-        ("pets", "7", "PETS"),
-        ("utilities", "5", "UTILITIES"),
-    ]
-    
-    selected_changes = random.sample(change_options, min(num_amendments + 1, len(change_options)))
-    
-    for change_type, section_num, section_title in selected_changes:
-        section_idx = int(section_num) - 1
-        original_content = amendment_sections[section_idx].content
-        
+    revisions = []
+    for change_type, section_num, section_title, section_idx in select_changes(CHANGE_OPTIONS, num_amendments):
         if change_type == "rent":
             new_rent = original_rent + random.randint(100, 300)
             new_content = (
@@ -143,25 +140,6 @@ def generate(num_amendments: int = 1) -> ContractPair:
             )
             description = "Changed utility split: Landlord now covers water/sewer/trash; added provision for unusual utility cost sharing"
         
-        amendment_sections[section_idx] = ContractSection(section_num, section_title, new_content)
-        
-        changes.append(Amendment(
-            section_number=section_num,
-            change_type="modified",
-            original_content=original_content,
-            new_content=new_content,
-            description=description
-        ))
-    
-    amendment_date = start_date + timedelta(days=random.randint(180, 365))
-    
-    amendment = ContractData(
-        title="AMENDMENT TO RESIDENTIAL LEASE AGREEMENT",
-        date=amendment_date.strftime("%B %d, %Y"),
-        parties=original.parties,
-        sections=amendment_sections,
-        signatures=original.signatures,
-        metadata={"type": "lease", "version": "amendment1"}
-    )
+        revisions.append((section_idx, ContractSection(section_num, section_title, new_content), description))
     
-    return ContractPair(original=original, amendment=amendment, changes=changes)
+    return amend(original, revisions, start_date, "AMENDMENT TO RESIDENTIAL LEASE AGREEMENT")
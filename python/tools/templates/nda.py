@@ -1,18 +1,27 @@
 import random
-from datetime import datetime, timedelta
-from faker import Faker
 
-from tools.templates.base import ContractData, ContractSection, ContractPair, Amendment
+from tools.templates.base import ContractData, ContractSection, ContractPair, amend, format_date, get_fake, random_city, random_start_date, random_state, select_changes
 
-fake = Faker()
+# Faker providers bound once: calls skip the proxy's attribute dispatch
+fake = get_fake()
+_company = fake.company
+
+
+# Amendable sections: (change type, section number, section title, index into the sections list)
+CHANGE_OPTIONS = (
+    ("scope", "1", "DEFINITION OF CONFIDENTIAL INFORMATION", 0),
+    ("permitted", "3", "PERMITTED DISCLOSURES", 2),
+    ("term", "5", "TERM AND TERMINATION", 4),
+    ("return", "6", "RETURN OF MATERIALS", 5),
+)
 
 
 def generate(num_amendments: int = 1) -> ContractPair:
     """Generate a Non-Disclosure Agreement with amendments."""
     
-    disclosing_party = fake.company()
-    receiving_party = fake.company()
-    start_date = fake.date_between(start_date="-2y", end_date="-1y")
+    disclosing_party = _company()
+    receiving_party = _company()
+    start_date = random_start_date()
     
     original_duration = random.choice([2, 3, 5])
     original_scope = "business strategies, financial data, customer lists, and technical specifications"
@@ -77,18 +86,18 @@ def generate(num_amendments: int = 1) -> ContractPair:
         ContractSection(
             number="8",
             title="GOVERNING LAW",
-            content=f"This Agreement shall be governed by the laws of {fake.state()}, without regard "
+            content=f"This Agreement shall be governed by the laws of {random_state()}, without regard "
                     f"to conflicts of law principles. Any disputes shall be resolved in the courts of "
-                    f"{fake.city()}, {fake.state()}."
+                    f"{random_city()}, {random_state()}."
         ),
     ]
     
     original = ContractData(
         title="NON-DISCLOSURE AGREEMENT",
-        date=start_date.strftime("%B %d, %Y"),
+        date=format_date(start_date),
         parties={
-            "Disclosing Party": f"{disclosing_party}, a {fake.state()} corporation",
-            "Receiving Party": f"{receiving_party}, a {fake.state()} corporation"
+            "Disclosing Party": f"{disclosing_party}, a {random_state()} corporation",
+            "Receiving Party": f"{receiving_party}, a {random_state()} corporation"
         },
         sections=original_sections,
         signatures=[f"{disclosing_party}, by authorized representative", 
@@ -96,22 +105,8 @@ def generate(num_amendments: int = 1) -> ContractPair:
         metadata={"type": "nda", "version": "original"}
     )
     
-    changes = []
-    amendment_sections = [ContractSection(s.number, s.title, s.content) for s in original_sections]
-    
-    change_options = [
-        ("scope", "1", "DEFINITION OF CONFIDENTIAL INFORMATION"),
-        ("permitted", "3", "PERMITTED DISCLOSURES"),
-        ("term", "5", "TERM AND TERMINATION"),
-        ("return", "6", "RETURN OF MATERIALS"),
-    ]
-    
-    selected_changes = random.sample(change_options, min(num_amendments + 1, len(change_options)))
-    
-    for change_type, section_num, section_title in selected_changes:
-        section_idx = int(section_num) - 1
-        original_content = amendment_sections[section_idx].content
-        
+    revisions = []
+    for change_type, section_num, section_title, section_idx in select_changes(CHANGE_OPTIONS, num_amendments):
         if change_type == "scope":
             new_scope = original_scope + ", source code, algorithms, product roadmaps, and merger/acquisition plans"
             new_content = (
@@ -153,25 +148,6 @@ def generate(num_amendments: int = 1) -> ContractPair:
             )
             description = "Added exception allowing retention of archival copy for legal compliance"
         
-        amendment_sections[section_idx] = ContractSection(section_num, section_title, new_content)
-        
-        changes.append(Amendment(
-            section_number=section_num,
-            change_type="modified",
-            original_content=original_content,
-            new_content=new_content,
-            description=description
-        ))
-    
-    amendment_date = start_date + timedelta(days=random.randint(180, 365))
-    
-    amendment = ContractData(
-        title="AMENDMENT TO NON-DISCLOSURE AGREEMENT",
-        date=amendment_date.strftime("%B %d, %Y"),
-        parties=original.parties,
-        sections=amendment_sections,
-        signatures=original.signatures,
-        metadata={"type": "nda", "version": "amendment1"}
-    )
+        revisions.append((section_idx, ContractSection(section_num, section_title, new_content), description))
     
-    return ContractPair(original=original, amendment=amendment, changes=changes)
+    return amend(original, revisions, start_date, "AMENDMENT TO NON-DISCLOSURE AGREEMENT")
@@ -1,18 +1,70 @@
 import random
-from datetime import datetime, timedelta
-from faker import Faker
 
-from tools.templates.base import ContractData, ContractSection, ContractPair, Amendment
+from tools.templates.base import ContractData, ContractSection, ContractPair, amend, format_date, get_fake, random_start_date, random_state, select_changes
 
-fake = Faker()
+# Faker providers bound once: calls skip the proxy's attribute dispatch
+fake = get_fake()
+_company = fake.company
+
+
+# Amendable sections: (change type, section number, section title, index into the sections list)
+CHANGE_OPTIONS = (
+    ("rate", "2", "COMPENSATION", 1),
+    ("term", "3", "TERM", 2),
+    ("ip", "4", "INTELLECTUAL PROPERTY", 3),
+    ("liability", "6", "LIABILITY", 5),
+)
+
+
+# Sections with no per-contract values, built once and shared (sections are frozen)
+TERM_SECTION = ContractSection(
+    number="3",
+    title="TERM",
+    content="This Agreement shall commence on the Effective Date and continue for a period "
+            "of 12 months, unless earlier terminated as provided herein. Either party may "
+            "terminate with 30 days written notice."
+)
+
+IP_SECTION = ContractSection(
+    number="4",
+    title="INTELLECTUAL PROPERTY",
+    content="All work product created by Provider in the course of performing services "
+            "shall be considered \"work for hire\" and shall be the exclusive property of "
+            "Client. Provider hereby assigns all rights, title, and interest in such work "
+            "product to Client."
+)
+
+CONFIDENTIALITY_SECTION = ContractSection(
+    number="5",
+    title="CONFIDENTIALITY",
+    content="Provider agrees to maintain the confidentiality of all Client information "
+            "obtained during the performance of services. This obligation shall survive "
+            "termination of this Agreement."
+)
+
+INSURANCE_SECTION = ContractSection(
+    number="7",
+    title="INSURANCE",
+    content="Provider shall maintain professional liability insurance with coverage of "
+            "at least $1,000,000 per occurrence and shall provide Client with certificate "
+            "of insurance upon request."
+)
+
+CONTRACTOR_SECTION = ContractSection(
+    number="8",
+    title="INDEPENDENT CONTRACTOR",
+    content="Provider is an independent contractor and not an employee of Client. Provider "
+            "shall be responsible for all taxes and benefits. Nothing in this Agreement "
+            "creates a partnership, joint venture, or agency relationship."
+)
 
 
 def generate(num_amendments: int = 1) -> ContractPair:
     """Generate a Service Agreement with amendments."""
     
-    provider = fake.company()
-    client = fake.company()
-    start_date = fake.date_between(start_date="-2y", end_date="-1y")
+    provider = _company()
+    client = _company()
+    start_date = random_start_date()
     
     service_type = random.choice(["software development", "consulting", "marketing", "IT support"])
     original_rate = random.randint(100, 300)
@@ -36,28 +88,9 @@ def generate(num_amendments: int = 1) -> ContractPair:
                     f"services performed. Payment is due within 30 days of invoice date. Estimated "
                     f"monthly hours: {original_hours} hours."
         ),
-        ContractSection(
-            number="3",
-            title="TERM",
-            content="This Agreement shall commence on the Effective Date and continue for a period "
-                    "of 12 months, unless earlier terminated as provided herein. Either party may "
-                    "terminate with 30 days written notice."
-        ),
-        ContractSection(
-            number="4",
-            title="INTELLECTUAL PROPERTY",
-            content="All work product created by Provider in the course of performing services "
-                    "shall be considered \"work for hire\" and shall be the exclusive property of "
-                    "Client. Provider hereby assigns all rights, title, and interest in such work "
-                    "product to Client."
-        ),
-        ContractSection(
-            number="5",
-            title="CONFIDENTIALITY",
-            content="Provider agrees to maintain the confidentiality of all Client information "
-                    "obtained during the performance of services. This obligation shall survive "
-                    "termination of this Agreement."
-        ),
+        TERM_SECTION,
+        IP_SECTION,
+        CONFIDENTIALITY_SECTION,
         ContractSection(
             number="6",
             title="LIABILITY",
@@ -65,28 +98,16 @@ def generate(num_amendments: int = 1) -> ContractPair:
                     f"${original_liability:,}. In no event shall either party be liable for "
                     f"indirect, incidental, special, or consequential damages."
         ),
-        ContractSection(
-            number="7",
-            title="INSURANCE",
-            content="Provider shall maintain professional liability insurance with coverage of "
-                    "at least $1,000,000 per occurrence and shall provide Client with certificate "
-                    "of insurance upon request."
-        ),
-        ContractSection(
-            number="8",
-            title="INDEPENDENT CONTRACTOR",
-            content="Provider is an independent contractor and not an employee of Client. Provider "
-                    "shall be responsible for all taxes and benefits. Nothing in this Agreement "
-                    "creates a partnership, joint venture, or agency relationship."
-        ),
+        INSURANCE_SECTION,
+        CONTRACTOR_SECTION,
     ]
     
     original = ContractData(
         title="SERVICE AGREEMENT",
-        date=start_date.strftime("%B %d, %Y"),
+        date=format_date(start_date),
         parties={
-            "Provider": f"{provider}, a {fake.state()} corporation",
-            "Client": f"{client}, a {fake.state()} corporation"
+            "Provider": f"{provider}, a {random_state()} corporation",
+            "Client": f"{client}, a {random_state()} corporation"
         },
         sections=original_sections,
         signatures=[f"{provider}, by authorized representative", 
@@ -94,22 +115,8 @@ def generate(num_amendments: int = 1) -> ContractPair:
         metadata={"type": "service", "version": "original"}
     )
     
-    changes = []
-    amendment_sections = [ContractSection(s.number, s.title, s.content) for s in original_sections]
-    
-    change_options = [
-        ("rate", "2", "COMPENSATION"),
-        ("term", "3", "TERM"),
-        ("ip", "4", "INTELLECTUAL PROPERTY"),
-        ("liability", "6", "LIABILITY"),
-    ]
-    
-    selected_changes = random.sample(change_options, min(num_amendments + 1, len(change_options)))
-    
-    for change_type, section_num, section_title in selected_changes:
-        section_idx = int(section_num) - 1
-        original_content = amendment_sections[section_idx].content
-        
+    revisions = []
+    for change_type, section_num, section_title, section_idx in select_changes(CHANGE_OPTIONS, num_amendments):
         if change_type == "rate":
             new_rate = original_rate + random.randint(25, 75)
             new_hours = original_hours + random.randint(10, 20)
@@ -152,25 +159,6 @@ def generate(num_amendments: int = 1) -> ContractPair:
             )
             description = f"Liability cap increased from ${original_liability:,} to ${new_liability:,}; added alternative based on fees paid; added exception for gross negligence"
         
-        amendment_sections[section_idx] = ContractSection(section_num, section_title, new_content)
-        
-        changes.append(Amendment(
-            section_number=section_num,
-            change_type="modified",
-            original_content=original_content,
-            new_content=new_content,
-            description=description
-        ))
-    
-    amendment_date = start_date + timedelta(days=random.randint(180, 365))
-    
-    amendment = ContractData(
-        title="AMENDMENT TO SERVICE AGREEMENT",
-        date=amendment_date.strftime("%B %d, %Y"),
-        parties=original.parties,
-        sections=amendment_sections,
-        signatures=original.signatures,
-        metadata={"type": "service", "version": "amendment1"}
-    )
+        revisions.append((section_idx, ContractSection(section_num, section_title, new_content), description))
     
-    return ContractPair(original=original, amendment=amendment, changes=changes)
+    return amend(original, revisions, start_date, "AMENDMENT TO SERVICE AGREEMENT")
@@ -0,0 +1,5 @@
+"""Entry point for the RabbitMQ worker (``python -m worker``)."""
+from src.adapters.rabbitmq_consumer import main
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,27 @@ class ContractAgentClient
   include HTTParty
   base_uri ENV.fetch("PYTHON_AGENT_URL", "http://localhost:8080")
 
+  SYNC_TIMEOUT_MS = 120_000
+  JOB_POLL_INTERVAL = 1
+  JOB_POLL_DEADLINE = 300 # 5 minutes total for LLM processing
+
   def compare(original_url:, amendment_url:, contract_id:)
     response = self.class.post(
       "/api/v1/contracts/compare",
       body: {
         original_image: original_url,
         amendment_image: amendment_url,
-        contract_id: contract_id
+        contract_id: contract_id,
+        async: false,
+        sync_timeout_ms: SYNC_TIMEOUT_MS
       }.to_json,
       headers: { "Content-Type" => "application/json" },
-      timeout: 300 # 5 minutes timeout for LLM processing
+      timeout: SYNC_TIMEOUT_MS / 1000 + 30
     )
 
+    # 202: the agent handed the job off to the background, poll until it finishes
+    response = wait_for_job(response.parsed_response["job_id"]) if response.code == 202
+
     if response.success?
       parsed = response.parsed_response
       {
@@ -63,4 +72,18 @@ class ContractAgentClient
   rescue HTTParty::Error, Timeout::Error, Net::ReadTimeout, Net::OpenTimeout
     nil
   end
+
+  private
+
+  def wait_for_job(job_id)
+    deadline = Time.now + JOB_POLL_DEADLINE
+
+    loop do
+      response = self.class.get("/api/v1/jobs/#{job_id}", timeout: 10)
+      return response unless response.success? && %w[pending processing].include?(response.parsed_response["status"])
+      raise Timeout::Error, "Job #{job_id} did not finish in #{JOB_POLL_DEADLINE}s" if Time.now > deadline
+
+      sleep JOB_POLL_INTERVAL
+    end
+  end
 end